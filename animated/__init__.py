@@ -0,0 +1 @@
+"""Shared video engine for every channel; per-channel settings live in profiles/*.json."""
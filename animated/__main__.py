@@ -0,0 +1,64 @@
+import os
+import sys
+import argparse
+
+from .config import list_profiles, load_profile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m animated", description="Channel-profile video generator")
+    parser.add_argument("--channel", action="append", default=[], help="profile name (repeatable)")
+    parser.add_argument("--audio", action="append", default=[], help="voiceover per --channel (default: MP3_FILE)")
+    parser.add_argument("--list", action="store_true", help="list available profiles and exit")
+    parser.add_argument("--bench-zoom", metavar="PNG", help="time the zoom engine on one frame and exit")
+    parser.add_argument("--bench-overlay", metavar="PNG", help="time caption overlay per frame and exit")
+    parser.add_argument("--bench-encode", metavar="PNG", help="moviepy vs direct ffmpeg pipe on one still and exit")
+    parser.add_argument("--bench-profiles", metavar="PNG", help="encode time vs size per encoding profile and exit")
+    parser.add_argument("--minutes", type=float, default=None,
+                        help="video length for --bench-encode (default 5) / --bench-profiles (default 1)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(list_profiles()))
+        return 0
+    if args.bench_zoom:
+        from .render import benchmark_zoom
+        benchmark_zoom(args.bench_zoom)
+        return 0
+    if args.bench_overlay:
+        from .overlay import benchmark_overlay
+        benchmark_overlay(args.bench_overlay)
+        return 0
+    if args.bench_encode:
+        from .render import benchmark_encoders
+        benchmark_encoders(args.bench_encode, args.minutes or 5.0)
+        return 0
+    if args.bench_profiles:
+        from .render import benchmark_profiles
+        benchmark_profiles(args.bench_profiles, args.minutes or 1.0)
+        return 0
+    if not args.channel:
+        parser.error("at least one --channel is required (see --list)")
+    if args.audio and len(args.audio) != len(args.channel):
+        parser.error("pass one --audio per --channel, or none to use MP3_FILE")
+
+    # ENV overrides (CHANNEL_NAME, ASPECT_RATIO, OUTPUT_DIR) only make sense for a single channel
+    single = len(args.channel) == 1
+    profiles = [load_profile(name, env_overrides=single) for name in args.channel]
+    audio_paths = args.audio or [os.environ.get("MP3_FILE")] * len(profiles)
+
+    from .pipeline import run
+
+    print("=" * 60)
+    print("YouTube Shorts Video Generator using Vertex AI")
+    print("=" * 60)
+
+    failed = 0
+    for profile, audio_path in zip(profiles, audio_paths):
+        if run(profile, audio_path) is None:
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
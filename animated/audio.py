@@ -0,0 +1,312 @@
+import os
+import time
+import hashlib
+import struct
+import subprocess
+
+from google.cloud import storage
+from moviepy import AudioFileClip
+from moviepy.config import FFMPEG_BINARY
+from vertexai.generative_models import Part
+
+from .config import (
+    AUDIO_TRANSCODE,
+    AUDIO_TRANSCODE_BITRATE,
+    AUDIO_UPLOAD_BUCKET,
+    INLINE_AUDIO_MAX_MB,
+)
+
+
+# -----------------------
+# PROBE
+# -----------------------
+_MP3_BITRATES_KBPS = {
+    "v1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "v2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+_probe_cache = {}
+
+
+def _probe_wav(f, file_size: int):
+    f.seek(12)
+    channels = sample_rate = byte_rate = 0
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+        if chunk_id == b"fmt ":
+            fmt = f.read(chunk_size)
+            _, channels, sample_rate, byte_rate = struct.unpack("<HHII", fmt[:12])
+            if chunk_size & 1:
+                f.seek(1, 1)
+        elif chunk_id == b"data":
+            # streamed WAVs may carry a placeholder size; trust the file length instead
+            data_size = min(chunk_size, file_size - f.tell())
+            if not byte_rate:
+                return None
+            return {"duration": data_size / byte_rate, "sample_rate": sample_rate, "channels": channels}
+        else:
+            f.seek(chunk_size + (chunk_size & 1), 1)
+
+
+def _probe_mp3(f, file_size: int):
+    head = f.read(10)
+    audio_start = 0
+    if head[:3] == b"ID3":
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        audio_start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+
+    f.seek(audio_start)
+    buf = f.read(64 * 1024)
+    for pos in range(len(buf) - 4):
+        if buf[pos] != 0xFF or (buf[pos + 1] & 0xE0) != 0xE0:
+            continue
+        version = (buf[pos + 1] >> 3) & 3
+        layer = (buf[pos + 1] >> 1) & 3
+        bitrate_idx = buf[pos + 2] >> 4
+        rate_idx = (buf[pos + 2] >> 2) & 3
+        if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+            continue  # not a layer III header; keep scanning
+
+        mpeg1 = version == 3
+        mono = (buf[pos + 3] >> 6) == 3
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+        samples_per_frame = 1152 if mpeg1 else 576
+        channels = 1 if mono else 2
+
+        # VBR files carry a total frame count in a Xing/Info or VBRI header
+        side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+        xing = pos + 4 + side_info
+        if buf[xing:xing + 4] in (b"Xing", b"Info"):
+            flags = struct.unpack(">I", buf[xing + 4:xing + 8])[0]
+            if flags & 1:
+                frames = struct.unpack(">I", buf[xing + 8:xing + 12])[0]
+                return {"duration": frames * samples_per_frame / sample_rate,
+                        "sample_rate": sample_rate, "channels": channels}
+        vbri = pos + 4 + 32
+        if buf[vbri:vbri + 4] == b"VBRI":
+            frames = struct.unpack(">I", buf[vbri + 14:vbri + 18])[0]
+            return {"duration": frames * samples_per_frame / sample_rate,
+                    "sample_rate": sample_rate, "channels": channels}
+
+        # CBR: audio bytes / bitrate
+        bitrate = _MP3_BITRATES_KBPS["v1" if mpeg1 else "v2"][bitrate_idx] * 1000
+        audio_bytes = file_size - audio_start - pos
+        f.seek(max(0, file_size - 128))
+        if f.read(3) == b"TAG":
+            audio_bytes -= 128
+        return {"duration": audio_bytes * 8 / bitrate, "sample_rate": sample_rate, "channels": channels}
+    return None
+
+
+def _iter_mp4_boxes(data: bytes, start: int, end: int):
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", data[pos + 8:pos + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield kind, pos + header, min(pos + size, end)
+        pos += size
+
+
+def _probe_mp4(f, file_size: int):
+    # walk top-level atoms with seeks; only moov is read into memory
+    moov = None
+    pos = 0
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(16)
+        size, kind = struct.unpack(">I4s", header[:8])
+        header_len = 8
+        if size == 1:
+            size = struct.unpack(">Q", header[8:16])[0]
+            header_len = 16
+        elif size == 0:
+            size = file_size - pos
+        if size < header_len:
+            return None
+        if kind == b"moov":
+            f.seek(pos + header_len)
+            moov = f.read(size - header_len)
+            break
+        pos += size
+    if moov is None:
+        return None
+
+    info = {"duration": 0.0, "sample_rate": 0, "channels": 0}
+    containers = {b"trak", b"mdia", b"minf", b"stbl"}
+
+    def walk(start, end):
+        for kind, body, box_end in _iter_mp4_boxes(moov, start, end):
+            if kind == b"mvhd":
+                if moov[body] == 1:
+                    timescale, duration = struct.unpack(">IQ", moov[body + 20:body + 32])
+                else:
+                    timescale, duration = struct.unpack(">II", moov[body + 12:body + 20])
+                if timescale:
+                    info["duration"] = duration / timescale
+            elif kind == b"stsd" and not info["channels"]:
+                entry = body + 8
+                if moov[entry + 4:entry + 8] in (b"mp4a", b"alac", b"Opus", b"ac-3", b"ec-3"):
+                    channels = struct.unpack(">H", moov[entry + 24:entry + 26])[0]
+                    rate = struct.unpack(">I", moov[entry + 32:entry + 36])[0] >> 16
+                    info["channels"], info["sample_rate"] = channels, rate
+            elif kind in containers:
+                walk(body, box_end)
+
+    walk(0, len(moov))
+    return info
+
+
+def _probe_with_ffmpeg(file_path: str):
+    audio = AudioFileClip(file_path)
+    info = {
+        "duration": float(audio.duration or 0.0),
+        "sample_rate": int(audio.fps or 0),
+        "channels": int(audio.nchannels or 0),
+    }
+    audio.close()
+    return info
+
+
+def probe_audio(file_path: str) -> dict:
+    """
+    Duration, sample rate and channels read straight from WAV / MP3 / MP4 headers,
+    without spawning ffmpeg. Memoized on (path, mtime, size) so every stage shares
+    one probe; unknown containers fall back to a moviepy reader.
+    """
+    st = os.stat(file_path)
+    key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+    if key in _probe_cache:
+        return _probe_cache[key]
+
+    info = None
+    with open(file_path, "rb") as f:
+        mime_type = _detect_audio_mime(f.read(16))
+        f.seek(0)
+        try:
+            if mime_type == "audio/wav":
+                info = _probe_wav(f, st.st_size)
+            elif mime_type == "audio/mpeg":
+                info = _probe_mp3(f, st.st_size)
+            elif mime_type == "audio/mp4":
+                info = _probe_mp4(f, st.st_size)
+        except (struct.error, IndexError, KeyError):
+            info = None
+
+    if not info or info["duration"] <= 0:
+        info = _probe_with_ffmpeg(file_path)
+
+    _probe_cache[key] = info
+    return info
+
+
+def get_audio_duration(file_path: str) -> float:
+    try:
+        return float(probe_audio(file_path)["duration"] or 0.0)
+    except Exception as e:
+        print(f"Error reading audio '{file_path}': {e}")
+        return 0.0
+
+
+# -----------------------
+# INGEST / UPLOAD
+# -----------------------
+_PCM_MIME_TYPES = {"audio/wav", "audio/aiff", "audio/flac"}
+
+
+def _detect_audio_mime(head: bytes) -> str:
+    # sniff the container from magic bytes; the file extension is not trusted
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "audio/wav"
+    if head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+        return "audio/aiff"
+    if head[:4] == b"fLaC":
+        return "audio/flac"
+    if head[:4] == b"OggS":
+        return "audio/ogg"
+    if head[4:8] == b"ftyp":
+        return "audio/mp4"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "audio/webm"
+    if len(head) > 1 and head[0] == 0xFF and (head[1] & 0xF6) == 0xF0:
+        return "audio/aac"  # ADTS
+    return "audio/mpeg"
+
+
+def _transcode_audio(audio_data: bytes, codec: str):
+    if codec == "opus":
+        codec_args = ["-c:a", "libopus", "-b:a", AUDIO_TRANSCODE_BITRATE, "-f", "ogg"]
+        mime_type = "audio/ogg"
+    else:
+        codec_args = ["-c:a", "libmp3lame", "-b:a", AUDIO_TRANSCODE_BITRATE, "-f", "mp3"]
+        mime_type = "audio/mpeg"
+
+    proc = subprocess.run(
+        [FFMPEG_BINARY, "-loglevel", "error", "-i", "pipe:0", "-vn", "-ac", "1", *codec_args, "pipe:1"],
+        input=audio_data,
+        capture_output=True,
+        check=True,
+    )
+    return proc.stdout, mime_type
+
+
+def _ingest_audio(audio_path: str):
+    """
+    Reads the voiceover and labels it with its real MIME type. Uncompressed
+    sources (TTS WAVs) are transcoded in memory so far fewer bytes go upstream.
+    """
+    with open(audio_path, "rb") as f:
+        audio_data = f.read()
+
+    mime_type = _detect_audio_mime(audio_data[:16])
+    size_mb = len(audio_data) / (1024 * 1024)
+
+    if mime_type in _PCM_MIME_TYPES and AUDIO_TRANSCODE != "off":
+        started = time.perf_counter()
+        try:
+            packed, packed_mime = _transcode_audio(audio_data, AUDIO_TRANSCODE)
+        except Exception as e:
+            print(f"⚠️  Audio transcode failed ({e}); sending {mime_type} as-is")
+        else:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            packed_mb = len(packed) / (1024 * 1024)
+            print(
+                f"✓ Audio {mime_type} {size_mb:.2f} MB -> {packed_mime} {packed_mb:.2f} MB "
+                f"({size_mb / max(packed_mb, 1e-6):.1f}x smaller, {elapsed_ms:.0f} ms)"
+            )
+            return packed, packed_mime
+
+    print(f"✓ Audio {mime_type} {size_mb:.2f} MB (sent as-is)")
+    return audio_data, mime_type
+
+
+def _upload_audio(audio_data: bytes, mime_type: str, bucket_name: str) -> str:
+    # content-addressed object name, so re-runs on the same voiceover skip the upload
+    digest = hashlib.sha256(audio_data).hexdigest()
+    blob = storage.Client().bucket(bucket_name).blob(f"audio/{digest}")
+    if not blob.exists():
+        blob.upload_from_string(audio_data, content_type=mime_type)
+    return f"gs://{bucket_name}/{blob.name}"
+
+
+def _build_audio_part(audio_data: bytes, mime_type: str):
+    """
+    One Part shared by every generate_content call. Large files are uploaded once
+    and referenced by URI instead of being re-sent inline with each request.
+    """
+    size_mb = len(audio_data) / (1024 * 1024)
+    if AUDIO_UPLOAD_BUCKET and size_mb > INLINE_AUDIO_MAX_MB:
+        uri = _upload_audio(audio_data, mime_type, AUDIO_UPLOAD_BUCKET)
+        print(f"✓ Uploaded audio once ({size_mb:.1f} MB): {uri}")
+        return Part.from_uri(uri=uri, mime_type=mime_type)
+    return Part.from_data(data=audio_data, mime_type=mime_type)
@@ -0,0 +1,233 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import itertools
+import subprocess
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .config import load_profile
+from .pipeline import prepare, render
+
+
+# -----------------------
+# CONFIGURATION (ENV-FIRST)
+# -----------------------
+# jobs allowed in the Gemini/Imagen stage at once (they share the process-wide Imagen limiter)
+BATCH_API_WORKERS = int(os.environ.get("BATCH_API_WORKERS", "2"))
+BATCH_POLL_SECONDS = float(os.environ.get("BATCH_POLL_SECONDS", "10"))
+
+
+def _job_fields(job):
+    if not isinstance(job, dict) or not isinstance(job.get("channel"), str) or not isinstance(job.get("audio"), str):
+        raise ValueError('expected {"channel": "...", "audio": "..."}')
+    return job["channel"], job["audio"]
+
+
+def load_jobs(path: str):
+    """
+    One job per line: {"channel": "rf", "audio": "rf/input/voice.mp3"}.
+    Blank lines and lines starting with # are skipped.
+    """
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            jobs.append(_job_fields(json.loads(line)))
+    return jobs
+
+
+# -----------------------
+# WARM BATCH RUNNER
+# -----------------------
+class BatchRunner:
+    """
+    Runs jobs through two lanes inside one process: up to `api_workers` jobs
+    wait on Vertex AI while the previous job renders. Rendering is a single
+    lane because create_video already fans segments out over every core.
+    """
+
+    def __init__(self, api_workers: int = BATCH_API_WORKERS):
+        self._api = ThreadPoolExecutor(max_workers=max(1, api_workers), thread_name_prefix="api")
+        self._render = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        self._profiles = {}
+        self._seq = itertools.count(1)
+        self._pending = []
+        self.records = []
+        self.started = time.perf_counter()
+
+    def _profile(self, channel: str) -> dict:
+        # env overrides are for single-channel runs; a mixed queue uses the profiles as written
+        if channel not in self._profiles:
+            self._profiles[channel] = load_profile(channel, env_overrides=False)
+        return self._profiles[channel]
+
+    def submit(self, channel: str, audio_path: str, on_done=None) -> Future:
+        record = {"channel": channel, "audio": audio_path, "ok": False, "api_s": 0.0, "render_s": 0.0}
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._seq):03d}"
+        done = Future()
+        if on_done:
+            done.add_done_callback(on_done)
+        self._pending.append(done)
+        self._api.submit(self._api_stage, record, run_id, done)
+        return done
+
+    def _finish(self, record: dict, done: Future, error=None):
+        self.records.append(record)
+        if error is not None:
+            record["error"] = str(error)
+            print(f"❌ [{record['channel']}] {record['audio']}: {error}")
+        done.set_result(record)
+
+    def _api_stage(self, record: dict, run_id: str, done: Future):
+        started = time.perf_counter()
+        try:
+            job = prepare(self._profile(record["channel"]), record["audio"], run_id)
+        except Exception as e:
+            job = None
+            record["error"] = str(e)
+        record["api_s"] = time.perf_counter() - started
+
+        if job is None:
+            self._finish(record, done, record.get("error", "nothing to render"))
+            return
+        self._render.submit(self._render_stage, record, job, done)
+
+    def _render_stage(self, record: dict, job: dict, done: Future):
+        started = time.perf_counter()
+        try:
+            record["output"] = render(job)
+            record["ok"] = True
+        except Exception as e:
+            record["render_s"] = time.perf_counter() - started
+            self._finish(record, done, e)
+            return
+        record["render_s"] = time.perf_counter() - started
+        print(
+            f"✓ [{record['channel']}] {record['output']} "
+            f"(api {record['api_s']:.1f}s, render {record['render_s']:.1f}s)"
+        )
+        self._finish(record, done)
+
+    def drain(self):
+        while self._pending:
+            self._pending.pop(0).result()
+
+    def shutdown(self):
+        self.drain()
+        self._api.shutdown()
+        self._render.shutdown()
+
+    def report(self) -> float:
+        wall = max(time.perf_counter() - self.started, 1e-6)
+        ok = sum(1 for r in self.records if r["ok"])
+        staged = sum(r["api_s"] + r["render_s"] for r in self.records)
+        rate = ok / wall * 3600
+        print("\n" + "=" * 60)
+        print(f"Batch: {ok}/{len(self.records)} videos in {wall:.1f}s -> {rate:.1f} videos/hour")
+        print(f"Stage time {staged:.1f}s overlapped into {wall:.1f}s wall ({staged / wall:.2f}x)")
+        print("=" * 60)
+        return rate
+
+
+def run_jobs(jobs, api_workers: int = BATCH_API_WORKERS) -> float:
+    runner = BatchRunner(api_workers)
+    for channel, audio_path in jobs:
+        runner.submit(channel, audio_path)
+    runner.shutdown()
+    return runner.report()
+
+
+def watch(spool_dir: str, api_workers: int = BATCH_API_WORKERS):
+    """
+    Daemon mode: every *.json file dropped into spool_dir is one job. It is
+    renamed to .running when claimed and to .done / .failed when finished;
+    a file that isn't a valid job goes straight to .failed.
+    """
+    runner = BatchRunner(api_workers)
+    print(f"Watching {spool_dir} for jobs (Ctrl+C to stop)...")
+
+    def _mark(path):
+        return lambda f: os.replace(path, path[:-len(".running")] + (".done" if f.result()["ok"] else ".failed"))
+
+    try:
+        while True:
+            for path in sorted(glob.glob(os.path.join(spool_dir, "*.json")), key=os.path.getmtime):
+                running = path + ".running"
+                try:
+                    os.replace(path, running)
+                except OSError as e:
+                    print(f"⚠️  Skipping {path}: {e}")  # gone, or claimed by another watcher
+                    continue
+                try:
+                    with open(running, "r", encoding="utf-8") as f:
+                        channel, audio_path = _job_fields(json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"❌ Bad job {path}: {e}")
+                    os.replace(running, path + ".failed")
+                    continue
+                runner.submit(channel, audio_path, on_done=_mark(running))
+            time.sleep(BATCH_POLL_SECONDS)
+    except KeyboardInterrupt:
+        print("\nStopping; finishing queued jobs...")
+    finally:
+        runner.shutdown()
+    runner.report()
+
+
+# -----------------------
+# BASELINE: ONE JOB PER PROCESS
+# -----------------------
+def run_baseline(jobs) -> float:
+    # same as the per-channel Actions jobs minus pip install: a cold interpreter per video
+    started = time.perf_counter()
+    ok = 0
+    for channel, audio_path in jobs:
+        cmd = [sys.executable, "-m", "animated", "--channel", channel, "--audio", audio_path]
+        ok += subprocess.run(cmd).returncode == 0
+    wall = max(time.perf_counter() - started, 1e-6)
+    rate = ok / wall * 3600
+    print("\n" + "=" * 60)
+    print(f"Baseline: {ok}/{len(jobs)} videos in {wall:.1f}s -> {rate:.1f} videos/hour")
+    print("=" * 60)
+    return rate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m animated.batch", description="Warm multi-channel batch runner")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--jobs", metavar="FILE", help="JSON-lines job list")
+    source.add_argument("--watch", metavar="DIR", help="spool directory to poll for *.json jobs")
+    parser.add_argument("--api-workers", type=int, default=BATCH_API_WORKERS)
+    parser.add_argument("--baseline", action="store_true", help="also run the jobs one process each and compare")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        watch(args.watch, args.api_workers)
+        return 0
+
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        print(f"❌ No jobs in {args.jobs}")
+        return 1
+
+    if not args.baseline:
+        run_jobs(jobs, args.api_workers)
+        return 0
+
+    if os.environ.get("IMAGE_CACHE_DIR", ".imagen_cache"):
+        print("⚠️  The image cache is on, so the second pass reuses the first pass's images. "
+              "Set IMAGE_CACHE_DIR= for a like-for-like comparison.")
+    baseline = run_baseline(jobs)
+    batch = run_jobs(jobs, args.api_workers)
+    print(f"Warm batch vs one-job-per-process: {batch / max(baseline, 1e-6):.2f}x videos/hour")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
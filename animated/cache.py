@@ -0,0 +1,35 @@
+import os
+
+
+# -----------------------
+# ON-DISK LRU CACHES
+# -----------------------
+# Shared by the image cache (images.py) and the segment cache (render.py). Entries are
+# plain files written under a temp name and renamed; mtime doubles as LRU recency.
+
+def touch(path: str):
+    # mark a cache hit as recently used
+    os.utime(path)
+
+
+def prune_lru(directory: str, max_mb: float, suffix: str) -> int:
+    # evict least-recently-used `suffix` files until `directory` fits max_mb; returns bytes kept
+    if not directory or not os.path.isdir(directory):
+        return 0
+    entries = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            # in-flight temp files belong to a writer that is still running
+            if name.endswith(suffix) and ".tmp." not in name:
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    limit = max_mb * 1024 * 1024
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        os.remove(path)
+        total -= size
+    return total
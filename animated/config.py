@@ -0,0 +1,129 @@
+import os
+import json
+from functools import lru_cache
+
+import vertexai
+from google.oauth2 import service_account
+from vertexai.generative_models import GenerativeModel
+
+from .encoding import get_encoding_profile
+
+
+# -----------------------
+# CONFIGURATION (ENV-FIRST)
+# -----------------------
+SERVICE_ACCOUNT_KEY = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+LOCATION = os.environ.get("LOCATION", "us-central1")
+
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-exp")
+
+IMAGE_DURATION = float(os.environ.get("IMAGE_DURATION", "5"))
+# adjacent segments at least this similar (TF-IDF cosine) share one image, each with its own
+# zoom/pan, up to IMAGE_REUSE_MAX segments per image; IMAGE_REUSE_MAX=1 = one image per segment
+IMAGE_REUSE_SIMILARITY = float(os.environ.get("IMAGE_REUSE_SIMILARITY", "0.2"))
+IMAGE_REUSE_MAX = int(os.environ.get("IMAGE_REUSE_MAX", "3"))
+ZOOM_QUALITY = os.environ.get("ZOOM_QUALITY", "bicubic").lower()  # bilinear | bicubic | lanczos
+
+# x264 settings + default frame rate, see encoding.PROFILES (draft | upload | archive)
+ENCODING_PROFILE = os.environ.get("ENCODING_PROFILE", "upload").lower()
+FPS = int(os.environ.get("FPS") or get_encoding_profile(ENCODING_PROFILE)["fps"])
+RENDER_MODE = os.environ.get("RENDER_MODE", "parallel").lower()  # parallel | serial | ffmpeg
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", "0")) or (os.cpu_count() or 1)
+ENCODER = os.environ.get("ENCODER", "pipe").lower()  # pipe (raw frames -> ffmpeg) | moviepy
+# RENDER_MODE=ffmpeg only: crossfade between stills (0 = hard cuts) and zoompan supersampling
+XFADE_SECONDS = float(os.environ.get("XFADE_SECONDS", "0"))
+ZOOMPAN_SUPERSAMPLE = int(os.environ.get("ZOOMPAN_SUPERSAMPLE", "2"))
+
+IMAGEN_RPM = float(os.environ.get("IMAGEN_RPM", "20"))
+IMAGEN_CONCURRENCY = int(os.environ.get("IMAGEN_CONCURRENCY", "4"))
+
+# raw Imagen output keyed by (model, prompt, aspect ratio); persist across runs with actions/cache
+IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", ".imagen_cache")
+IMAGE_CACHE_MAX_MB = float(os.environ.get("IMAGE_CACHE_MAX_MB", "2048"))
+# encoded zoom segments keyed by (still, caption, frames, zoom, encoding profile), so a re-render
+# only re-encodes the segments whose inputs changed; empty = off
+SEGMENT_CACHE_DIR = os.environ.get("SEGMENT_CACHE_DIR", ".segment_cache")
+SEGMENT_CACHE_MAX_MB = float(os.environ.get("SEGMENT_CACHE_MAX_MB", "4096"))
+# frames stay in memory from Imagen to the encoder; set to also write captioned PNGs for debugging
+SAVE_FRAMES = os.environ.get("SAVE_FRAMES", "").lower() in ("1", "true", "yes")
+
+# voiceovers above INLINE_AUDIO_MAX_MB go to this GCS bucket once; unset = always inline
+AUDIO_UPLOAD_BUCKET = os.environ.get("AUDIO_UPLOAD_BUCKET")
+INLINE_AUDIO_MAX_MB = float(os.environ.get("INLINE_AUDIO_MAX_MB", "8"))
+AUDIO_TRANSCODE = os.environ.get("AUDIO_TRANSCODE", "mp3").lower()  # mp3 | opus | off (WAV/PCM inputs only)
+AUDIO_TRANSCODE_BITRATE = os.environ.get("AUDIO_TRANSCODE_BITRATE", "32k")
+
+
+# -----------------------
+# CHANNEL PROFILES
+# -----------------------
+PROFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+# profile key -> env var that overrides it (single-channel runs keep the old ENV-FIRST behaviour)
+_PROFILE_ENV = {
+    "channel_name": "CHANNEL_NAME",
+    "aspect_ratio": "ASPECT_RATIO",
+    "output_dir": "OUTPUT_DIR",
+}
+
+
+def list_profiles():
+    return sorted(f[:-5] for f in os.listdir(PROFILES_DIR) if f.endswith(".json"))
+
+
+def load_profile(name: str, env_overrides: bool = True) -> dict:
+    path = os.path.join(PROFILES_DIR, f"{name}.json")
+    if not os.path.exists(path):
+        raise ValueError(f"Unknown channel profile '{name}'. Available: {', '.join(list_profiles())}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        profile = json.load(f)
+    profile["name"] = name
+
+    if env_overrides:
+        for key, env_name in _PROFILE_ENV.items():
+            if os.environ.get(env_name):
+                profile[key] = os.environ[env_name]
+    return profile
+
+
+# -----------------------
+# INIT VERTEX AI
+# -----------------------
+_vertex_ready = False
+
+
+def init_vertex_ai():
+    # once per process; a warm multi-channel run reuses the same client
+    global _vertex_ready
+    if _vertex_ready:
+        return
+
+    if not SERVICE_ACCOUNT_KEY:
+        raise RuntimeError(
+            "GOOGLE_APPLICATION_CREDENTIALS is not set. "
+            "Set it to the path of your service account JSON."
+        )
+
+    if not os.path.exists(SERVICE_ACCOUNT_KEY):
+        raise FileNotFoundError(f"Missing credentials file at: {SERVICE_ACCOUNT_KEY}")
+
+    with open(SERVICE_ACCOUNT_KEY, "r", encoding="utf-8") as f:
+        sa_info = json.load(f)
+
+    project_id = os.environ.get("GOOGLE_CLOUD_PROJECT") or sa_info.get("project_id")
+    if not project_id:
+        raise RuntimeError("Could not determine project_id from service account JSON.")
+
+    credentials = service_account.Credentials.from_service_account_file(SERVICE_ACCOUNT_KEY)
+    vertexai.init(project=project_id, location=LOCATION, credentials=credentials)
+
+    _vertex_ready = True
+    print(f"✓ Project ID: {project_id}")
+    print(f"✓ Location: {LOCATION}")
+
+
+@lru_cache(maxsize=None)
+def get_gemini_model():
+    # one handle per process, shared by transcript, prompts and metadata (and every batch job)
+    return GenerativeModel(GEMINI_MODEL)
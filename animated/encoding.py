@@ -0,0 +1,83 @@
+import sys
+
+
+# -----------------------
+# ENCODING PROFILES
+# -----------------------
+# One table for the Python renderer and the cmc/ shell script, which calls
+#   ENC_ARGS=$(python3 animated/encoding.py draft 1)
+# to get the same x264 flags. No package imports here, so the file also runs on its own.
+# Every profile is tuned for stills (-tune stillimage), so it is not meant for motion
+# footage such as the zzs/ Veo clips.
+#
+# gop_seconds is converted to frames at the output rate; threads 0 = let x264 decide.
+# fps is the renderer's default output rate for the profile (FPS env still wins);
+# the shell script passes its own rate.
+#
+# Measured with `python -m animated --bench-profiles STILL --minutes N` (pipe encoder, one
+# synthetic scene-like still, re-zoomed every 5 s, silent audio, 1 CPU core, ffmpeg 7.0.2):
+#
+#   60 s short, 1080x1920                    10 min long, 1920x1080
+#   profile  frames  encode    size          frames  encode     size
+#   draft       900    72.0s   10.7 MB         9000    698.2s   111.9 MB
+#   upload     1440   313.4s   34.5 MB        14400   3101.5s   347.5 MB
+#   archive    1440   582.0s   51.9 MB        14400   5697.5s   534.4 MB
+#
+# Encode time includes the Python zoom render feeding ffmpeg, so it scales with frames
+# as well as preset; more cores shorten every row while sizes barely move.
+PROFILES = {
+    # fast previews and the 4 h cmc stream: cheapest encode, biggest file. The long GOP
+    # matters at cmc's 1 fps: a keyframe every 10 s made a static stream ~14x bigger
+    "draft": {"preset": "ultrafast", "tune": "stillimage", "crf": 23, "gop_seconds": 250, "threads": 0,
+              "fps": 15, "faststart": True},
+    # the default for generated videos: 2 s GOP for fast seeking after upload
+    "upload": {"preset": "medium", "tune": "stillimage", "crf": 21, "gop_seconds": 2, "threads": 0,
+               "fps": 24, "faststart": True},
+    # masters worth keeping: slow preset, near-transparent quality
+    "archive": {"preset": "slow", "tune": "stillimage", "crf": 17, "gop_seconds": 10, "threads": 0,
+                "fps": 24, "faststart": True},
+}
+
+
+def get_encoding_profile(name: str) -> dict:
+    if name not in PROFILES:
+        raise ValueError(f"Unknown encoding profile '{name}'. Available: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def x264_tuning_args(name: str, fps: float, faststart=True):
+    """
+    The profile-specific flags only (-tune/-crf/-g/-movflags), for writers such
+    as moviepy that already emit codec, preset, threads and pixel format.
+    """
+    p = get_encoding_profile(name)
+    args = ["-tune", p["tune"], "-crf", str(p["crf"]), "-g", str(max(1, int(round(p["gop_seconds"] * fps))))]
+    if faststart and p["faststart"]:
+        args += ["-movflags", "+faststart"]
+    return args
+
+
+def x264_args(name: str, fps: float, threads=None, faststart=True):
+    """
+    ffmpeg output args for libx264 video under profile `name`. `threads`
+    overrides the profile (the segment workers split the cores themselves);
+    faststart=False for intermediate files that are concatenated later.
+    """
+    p = get_encoding_profile(name)
+    args = ["-c:v", "libx264", "-preset", p["preset"]] + x264_tuning_args(name, fps, faststart=False)
+    args += ["-threads", str(p["threads"] if threads is None else threads), "-pix_fmt", "yuv420p"]
+    if faststart and p["faststart"]:
+        args += ["-movflags", "+faststart"]
+    return args
+
+
+if __name__ == "__main__":
+    # python3 animated/encoding.py PROFILE [FPS] -> flags on one line, for $(...) in shell scripts
+    if len(sys.argv) < 2:
+        sys.exit(f"usage: {sys.argv[0]} {{{','.join(PROFILES)}}} [fps]")
+    try:
+        name = sys.argv[1]
+        fps = float(sys.argv[2]) if len(sys.argv) > 2 else get_encoding_profile(name)["fps"]
+        print(" ".join(x264_args(name, fps)))
+    except ValueError as e:
+        sys.exit(str(e))
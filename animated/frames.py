@@ -0,0 +1,47 @@
+import io
+
+from PIL import Image
+
+from .overlay import _draw_caption, caption_sprite
+
+
+class Frame:
+    """
+    One still as it travels from Imagen to the encoder: the raw image bytes
+    plus its caption. Picklable, so it goes straight to a render worker, which
+    decodes once and bakes the caption in; no intermediate PNGs on disk.
+    """
+
+    def __init__(self, index: int, image_bytes: bytes, caption: str, position: str = "bottom", motion: int = 0):
+        self.index = index
+        self.image_bytes = image_bytes
+        self.caption = caption
+        self.position = position
+        self.motion = motion  # index into render.MOTIONS
+
+    def __repr__(self):
+        motion = f", motion {self.motion}" if self.motion else ""
+        return f"Frame({self.index}, {len(self.image_bytes)} bytes, {self.caption!r}{motion})"
+
+    def with_motion(self, motion: int):
+        # the same still for another segment that reuses it; shares the bytes, no copy
+        return Frame(self.index, self.image_bytes, self.caption, self.position, motion)
+
+    def verify(self):
+        # cheap header/CRC check so a corrupt download falls back like a failed request
+        Image.open(io.BytesIO(self.image_bytes)).verify()
+
+    def background(self):
+        return Image.open(io.BytesIO(self.image_bytes)).convert("RGB")
+
+    def sprite(self, size):
+        return caption_sprite(size, self.caption, self.position)
+
+    def to_image(self):
+        # caption burned in, as the old PNGs were (SAVE_FRAMES debug output)
+        img = Image.open(io.BytesIO(self.image_bytes)).convert("RGBA")
+        return _draw_caption(img, self.caption, self.position).convert("RGB")
+
+    def save(self, path: str) -> str:
+        self.to_image().save(path)
+        return path
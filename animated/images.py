@@ -0,0 +1,242 @@
+import os
+import re
+import time
+import json
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from vertexai.preview.vision_models import ImageGenerationModel
+
+from .cache import prune_lru, touch
+from .config import IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_MB, IMAGEN_CONCURRENCY, IMAGEN_RPM, SAVE_FRAMES
+from .frames import Frame
+
+
+_image_cache_lock = threading.Lock()
+_image_cache_stats = {"hits": 0, "misses": 0}
+
+
+class _TokenBucket:
+    """
+    Requests-per-minute limiter shared by every image worker.
+    A 429 from any worker pauses the whole bucket, so retries back off together.
+    """
+
+    def __init__(self, rpm: float, burst: int = 1):
+        self.rate = max(rpm, 0.1) / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+                self.updated = max(self.updated, now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate + max(0.0, self.updated - now)
+            time.sleep(wait)
+
+    def back_off(self, seconds: float):
+        with self.lock:
+            # no tokens accrue until the pause is over
+            self.tokens = 0.0
+            self.updated = max(self.updated, time.monotonic() + seconds)
+
+
+def _image_cache_path(model_name: str, prompt: str, aspect_ratio: str):
+    if not IMAGE_CACHE_DIR:
+        return None
+    key = hashlib.sha256(json.dumps([model_name, prompt, aspect_ratio]).encode("utf-8")).hexdigest()
+    return os.path.join(IMAGE_CACHE_DIR, key[:2], f"{key}.png")
+
+
+def _image_cache_fetch(cache_path):
+    data = None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        touch(cache_path)
+    with _image_cache_lock:
+        _image_cache_stats["hits" if data else "misses"] += 1
+    return data
+
+
+def _image_cache_store(cache_path, data: bytes):
+    if not cache_path:
+        return
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@lru_cache(maxsize=None)
+def _imagen_bucket():
+    # one limiter per process: concurrent jobs share the same Imagen quota
+    return _TokenBucket(IMAGEN_RPM)
+
+
+@lru_cache(maxsize=None)
+def _load_imagen_model():
+    try:
+        print("Loading Imagen 4 model...")
+        model_name = "imagen-4.0-fast-generate-001"
+        model = ImageGenerationModel.from_pretrained(model_name)
+        print("✓ Using Imagen 4 Fast")
+    except Exception as e:
+        print(f"⚠️  Imagen 4 not available: {e}")
+        model_name = "imagen-3.0-generate-002"
+        model = ImageGenerationModel.from_pretrained(model_name)
+        print("⚠️  Using Imagen 3")
+    return model, model_name
+
+
+def _imagen_bytes(generated) -> bytes:
+    # the SDK keeps the decoded response bytes; only round-trip through a file if it doesn't
+    data = getattr(generated, "_image_bytes", None)
+    if data:
+        return data
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "image.png")
+        generated.save(location=path)
+        with open(path, "rb") as f:
+            return f.read()
+
+
+def _generate_one(i: int, total: int, prompt_line: str, model, model_name: str, bucket, profile: dict, frames_dir: str):
+    text_overlay = None
+    prompt = prompt_line
+
+    text_match = re.search(r"\[TEXT:\s*([^\]]+)\]", prompt_line)
+    if text_match:
+        text_overlay = text_match.group(1).strip()
+        prompt = re.sub(r"\[TEXT:[^\]]+\]", "", prompt_line).strip()
+    else:
+        # ensure overlay always exists
+        text_overlay = "Key update"
+    print(f"Processing image {i+1}/{total}... 📝 {text_overlay}")
+
+    cache_path = _image_cache_path(model_name, prompt, profile["aspect_ratio"])
+    position = profile.get("caption_position", "bottom")
+
+    # always overlay text; the renderer bakes it in while decoding for the zoom
+    frame = None
+    data = _image_cache_fetch(cache_path)
+    if data:
+        frame = Frame(i, data, text_overlay, position)
+        try:
+            frame.verify()
+            print(f"  ♻️  [{i+1}/{total}] Cache hit")
+        except Exception as e:
+            # a truncated/corrupt entry would otherwise fail this prompt on every run
+            print(f"  ⚠️  [{i+1}/{total}] Cached image unreadable ({e}); regenerating")
+            os.remove(cache_path)
+            frame = None
+
+    if frame is None:
+        max_retries = 5
+        retry_delay = 10
+
+        for attempt in range(max_retries):
+            bucket.acquire()
+            try:
+                images = model.generate_images(
+                    prompt=prompt,
+                    number_of_images=1,
+                    aspect_ratio=profile["aspect_ratio"],
+                    add_watermark=False,
+                )
+                frame = Frame(i, _imagen_bytes(images[0]), text_overlay, position)
+                frame.verify()
+                break
+
+            except Exception as e:
+                msg = str(e)
+                if ("429" in msg or "Quota exceeded" in msg) and attempt < max_retries - 1:
+                    print(f"  ⚠️  [{i+1}/{total}] Rate limit hit; pausing all workers {retry_delay}s...")
+                    bucket.back_off(retry_delay)
+                    retry_delay *= 2
+                else:
+                    print(f"  ✗ [{i+1}/{total}] Image failed: {e}")
+                    return None
+
+        # only bytes that decode are cached; a failed write (full disk, read-only cache dir)
+        # costs a regenerate on the next run, not this image
+        try:
+            _image_cache_store(cache_path, frame.image_bytes)
+        except OSError as e:
+            print(f"  ⚠️  [{i+1}/{total}] Image cache write failed: {e}")
+
+    if SAVE_FRAMES:
+        try:
+            frame.save(os.path.join(frames_dir, f"frame_{i:03d}.png"))
+        except Exception as e:
+            print(f"  ✗ [{i+1}/{total}] Frame unusable: {e}")
+            return None
+
+    print(f"  ✓ [{i+1}/{total}] Ready: {frame!r}")
+    return frame
+
+
+def generate_images(prompts, profile: dict, frames_dir: str = "generated_frames", on_image=None):
+    """
+    Returns in-memory Frames in prompt order. on_image(i, frame_or_None) fires
+    from the worker as soon as frame i is ready, so the caller can start
+    encoding before the whole batch is back. PNGs land in frames_dir only
+    with SAVE_FRAMES=1.
+    """
+    if SAVE_FRAMES:
+        os.makedirs(frames_dir, exist_ok=True)
+    model, model_name = _load_imagen_model()
+
+    total = len(prompts)
+    workers = max(1, min(IMAGEN_CONCURRENCY, total or 1))
+    bucket = _imagen_bucket()
+    print(f"\nGenerating {total} images ({workers} workers, {IMAGEN_RPM:g} requests/min)...")
+
+    def _job(job):
+        frame = _generate_one(job[0], total, job[1], model, model_name, bucket, profile, frames_dir)
+        if on_image:
+            on_image(job[0], frame)
+        return frame
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map() keeps results in prompt order regardless of completion order
+        results = list(pool.map(_job, enumerate(prompts)))
+    elapsed = max(time.perf_counter() - started, 1e-6)
+
+    frames = []
+    for i, frame in enumerate(results):
+        if frame:
+            frames.append(frame)
+        elif frames:
+            frames.append(frames[-1])
+            print(f"  → Image {i+1} using fallback: {frames[-1]!r}")
+
+    generated = sum(1 for frame in results if frame)
+    print(
+        f"✓ Generated {generated}/{total} images in {elapsed:.1f}s "
+        f"({generated / elapsed * 60:.1f} images/min)"
+    )
+    if IMAGE_CACHE_DIR:
+        kept = prune_lru(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_MB, ".png")
+        print(
+            # counters are per process, so a batch run reports its running total
+            f"✓ Image cache: {_image_cache_stats['hits']} hits, {_image_cache_stats['misses']} misses "
+            f"({kept / (1024 * 1024):.1f} MB in {IMAGE_CACHE_DIR})"
+        )
+    return frames
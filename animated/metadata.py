@@ -0,0 +1,70 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import get_gemini_model
+
+
+# -----------------------
+# SEO METADATA JSON
+# -----------------------
+_metadata_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="metadata")
+
+
+def generate_youtube_metadata_json(transcript: str, profile: dict) -> dict:
+    channel_name = profile["channel_name"]
+    model = get_gemini_model()
+
+    prompt = f"""
+You are an expert YouTube SEO copywriter.
+
+Channel: {channel_name}
+Content type: {profile["content_type"]}
+Topic: {profile["seo_topic"]} (use transcript to infer exact topic)
+
+Transcript:
+{transcript}
+
+Create SEO-optimized metadata in STRICT JSON ONLY (no markdown, no commentary), with exactly these keys:
+{{
+  "title": "...",
+  "description": "...",
+  "hashtags": ["#tag1", "#tag2", "..."]
+}}
+
+Rules:
+- Title must be <= 100 characters.
+- Description must be <= 500 characters.
+- Put the primary keyword in the first 50 characters of the title.
+- First 150 characters of description should be a strong hook + topic summary.
+- Include a short CTA to subscribe to "{channel_name}" near the top.
+- Hashtags: 5 to 12 total, {profile["hashtag_topic"]}-relevant, include #shorts, and avoid duplicates.
+- Hashtags must start with # and contain no spaces.
+"""
+
+    resp = model.generate_content(prompt)
+    text = (resp.text or "").strip()
+
+    try:
+        data = json.loads(text)
+    except Exception:
+        start = text.find("{")
+        end = text.rfind("}")
+        if start == -1 or end == -1 or end <= start:
+            raise RuntimeError("Model did not return JSON.")
+        data = json.loads(text[start: end + 1])
+
+    data["hashtags"] = [h.strip() for h in data.get("hashtags", []) if isinstance(h, str) and h.strip().startswith("#")]
+    data["title"] = str(data.get("title", "")).strip()
+    data["description"] = str(data.get("description", "")).strip()
+    return data
+
+
+def start_metadata(transcript: str, profile: dict):
+    # only needs the transcript, so it runs alongside prompts and images; result() before saving
+    return _metadata_pool.submit(generate_youtube_metadata_json, transcript, profile)
+
+
+def save_metadata_json(metadata: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    print(f"✓ Saved metadata JSON: {path}")
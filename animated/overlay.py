@@ -0,0 +1,242 @@
+import os
+import re
+import time
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+_FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/Library/Fonts/Arial Bold.ttf",
+]
+_MIN_FONT_SIZE = 12
+
+
+# -----------------------
+# FONT REGISTRY
+# -----------------------
+@lru_cache(maxsize=None)
+def _font_path():
+    # probed once per process instead of once per frame
+    for p in _FONT_PATHS:
+        if os.path.exists(p):
+            try:
+                ImageFont.truetype(p, _MIN_FONT_SIZE)
+                return p
+            except Exception:
+                pass
+    return None
+
+
+@lru_cache(maxsize=None)
+def _load_font(path, size: int):
+    # parsed once per (font, size); a warm batch process reuses it across videos
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=None)
+def _advance(path, size: int, ch: str) -> float:
+    # glyph cache: advance width per (font, size, char); captions reuse the same few dozen glyphs
+    return _load_font(path, size).getlength(ch)
+
+
+def _glyph_width(path, size: int, text: str) -> float:
+    return sum(_advance(path, size, ch) for ch in text)
+
+
+def fit_font(text: str, base_size: int, max_width: int):
+    """
+    Largest size <= base_size whose rendered width fits max_width. The binary
+    search runs on cached glyph advances; only the winner is measured exactly
+    (kerning can make the real line a little wider than the glyph sum).
+    """
+    path = _font_path()
+    if path is None:
+        return _load_font(None, base_size)
+
+    lo, hi, size = _MIN_FONT_SIZE, base_size, _MIN_FONT_SIZE
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if _glyph_width(path, mid, text) <= max_width:
+            size, lo = mid, mid + 1
+        else:
+            hi = mid - 1
+
+    font = _load_font(path, size)
+    while size > _MIN_FONT_SIZE and font.getlength(text) > max_width:
+        size -= 1
+        font = _load_font(path, size)
+    return font
+
+
+def _legacy_fit_font(text: str, base_size: int, max_width: int):
+    # the pre-registry path (probe every font path, reload, scale once); kept for benchmark_overlay
+    font, chosen = ImageFont.load_default(), None
+    for p in _FONT_PATHS:
+        if os.path.exists(p):
+            try:
+                font, chosen = ImageFont.truetype(p, base_size), p
+                break
+            except Exception:
+                pass
+    bbox = font.getbbox(text)
+    text_width = bbox[2] - bbox[0]
+    if text_width > max_width and chosen:
+        font = ImageFont.truetype(chosen, max(_MIN_FONT_SIZE, int(base_size * max_width / max(text_width, 1))))
+    return font
+
+
+# -----------------------
+# CAPTION
+# -----------------------
+def _caption_layout(size, text: str, position: str = "bottom", fit=fit_font):
+    # returns (text, font, text_xy, box) with box the opaque caption background in frame pixels
+    width, height = size
+
+    # slightly larger baseline for better visibility
+    base_font_size = int(height * 0.06)
+    if len(text) > 20:
+        base_font_size = int(base_font_size * 0.75)
+    elif len(text) > 15:
+        base_font_size = int(base_font_size * 0.85)
+
+    # clamp overlay length (keeps it readable)
+    text = re.sub(r"\s+", " ", (text or "").strip())
+    if len(text) > 60:
+        text = text[:57].rstrip() + "..."
+
+    font = fit(text, base_font_size, int(width * 0.9))
+    bbox = font.getbbox(text)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    # bottom = near bottom center (more “subtitle-like”); center = middle of the frame
+    x = (width - text_width) // 2
+    y = (height - text_height) // 2 if position == "center" else int(height * 0.78)
+
+    padding = int(height * 0.02)
+    box = (x - padding, y - padding, x + text_width + padding, y + text_height + padding)
+    return text, font, (x, y), box
+
+
+def _draw_caption(img, text: str, position: str = "bottom", fit=fit_font, stroke=True):
+    text, font, (x, y), box = _caption_layout(img.size, text, position, fit)
+    draw = ImageDraw.Draw(img)
+    draw.rectangle(list(box), fill=(0, 0, 0, 220))
+
+    outline_width = 2
+    if stroke:
+        # one rasterization: FreeType strokes the outline and the fill goes on top
+        draw.text((x, y), text, font=font, fill=(255, 215, 0, 255),
+                  stroke_width=outline_width, stroke_fill=(0, 0, 0, 255))
+        return img
+
+    # legacy: 24 offset copies for the outline, then the fill (kept for benchmark_overlay)
+    for ox in range(-outline_width, outline_width + 1):
+        for oy in range(-outline_width, outline_width + 1):
+            if ox == 0 and oy == 0:
+                continue
+            draw.text((x + ox, y + oy), text, font=font, fill=(0, 0, 0, 255))
+
+    draw.text((x, y), text, font=font, fill=(255, 215, 0, 255))
+    return img
+
+
+def caption_sprite(size, text: str, position: str = "bottom"):
+    """
+    The caption as a pre-rendered patch for compositing over an already zoomed
+    background: (rgb array, (x0, y0, x1, y1)). The background box is opaque in
+    the final frame, so the patch is pasted as-is, never resampled.
+    """
+    text, font, (x, y), box = _caption_layout(size, text, position)
+    x0, y0 = max(0, box[0]), max(0, box[1])
+    x1, y1 = min(size[0], box[2]), min(size[1], box[3])
+
+    patch = Image.new("RGB", (x1 - x0, y1 - y0), (0, 0, 0))
+    ImageDraw.Draw(patch).text(
+        (x - x0, y - y0), text, font=font, fill=(255, 215, 0),
+        stroke_width=2, stroke_fill=(0, 0, 0),
+    )
+    return np.asarray(patch), (x0, y0, x1, y1)
+
+
+def add_text_overlay(image_path: str, text: str, output_path: str, position: str = "bottom") -> str:
+    img = Image.open(image_path).convert("RGBA")
+    _draw_caption(img, text, position)
+    img.save(output_path)
+    return output_path
+
+
+def benchmark_overlay(image_path: str, frames: int = 120):
+    """
+    Per-frame overlay time for the old font path vs the registry + binary-search
+    fit, and for the 24-draw outline vs native stroke, plus how far the stroked
+    caption drifts from the old pixels. Run with: python -m animated --bench-overlay frame.png
+    """
+    base = Image.open(image_path).convert("RGBA")
+    captions = [
+        "Save tax the smart way",
+        "Why your SIP beats the FD over ten years",
+        "Rates are up",
+        "The one rule every investor forgets about compounding",
+    ]
+    texts = [captions[i % len(captions)] for i in range(frames)]
+    out_path = os.path.join(tempfile.mkdtemp(prefix="overlay_bench_"), "frame.png")
+
+    results = {}
+    variants = (
+        ("legacy", _legacy_fit_font, False),
+        ("registry", fit_font, False),
+        ("stroke", fit_font, True),
+    )
+    for name, fit, stroke in variants:
+        _font_path.cache_clear()
+        _load_font.cache_clear()
+        _advance.cache_clear()
+
+        start = time.perf_counter()
+        for text in texts:
+            fit(text, int(base.size[1] * 0.06 * 0.75), int(base.size[0] * 0.9))
+        fit_ms = (time.perf_counter() - start) * 1000 / frames
+
+        start = time.perf_counter()
+        for text in texts:
+            _draw_caption(base.copy(), text, fit=fit, stroke=stroke).save(out_path)
+        total_ms = (time.perf_counter() - start) * 1000 / frames
+
+        start = time.perf_counter()
+        for text in texts:
+            _draw_caption(base.copy(), text, fit=fit, stroke=stroke)
+        draw_ms = (time.perf_counter() - start) * 1000 / frames
+        results[name] = (fit_ms, draw_ms, total_ms)
+
+    os.remove(out_path)
+    os.rmdir(os.path.dirname(out_path))
+
+    # golden check: stroked caption vs the 24-draw outline on the same frame
+    worst = (0.0, 0)
+    for text in captions:
+        old = np.asarray(_draw_caption(base.copy(), text, stroke=False), dtype=np.int16)
+        new = np.asarray(_draw_caption(base.copy(), text, stroke=True), dtype=np.int16)
+        diff = np.abs(old - new).max(axis=2)
+        worst = max(worst, (float(diff.mean()), int((diff > 64).sum())))
+
+    print(f"Overlay benchmark: {base.size[0]}x{base.size[1]}, {frames} frames, font {_font_path()}")
+    for name, (fit_ms, draw_ms, total_ms) in results.items():
+        print(
+            f"  {name:<9} font fit {fit_ms:6.3f} ms   caption draw {draw_ms:6.2f} ms   "
+            f"+ PNG save {total_ms:7.2f} ms   (per frame)"
+        )
+    legacy, registry, stroke = results["legacy"], results["registry"], results["stroke"]
+    print(f"  font fit {legacy[0] / max(registry[0], 1e-9):.1f}x faster")
+    print(f"  caption draw {registry[1] / max(stroke[1], 1e-9):.1f}x faster with stroke_width")
+    print(f"  stroke vs 24-draw outline: mean abs diff {worst[0]:.3f}/255, {worst[1]} px differ by > 64")
+    return results
@@ -0,0 +1,112 @@
+import os
+import math
+import time
+from datetime import datetime
+
+from .audio import get_audio_duration
+from .config import IMAGE_DURATION, RENDER_MODE, init_vertex_ai
+from .images import generate_images
+from .metadata import save_metadata_json, start_metadata
+from .render import SegmentPipeline, create_video
+from .transcript import generate_prompts_and_transcript_from_audio
+
+
+# -----------------------
+# STAGE 1: API-BOUND (Gemini + Imagen)
+# -----------------------
+def prepare(profile: dict, audio_path: str, run_id: str = None):
+    """
+    Everything that waits on Vertex AI. Returns a job dict for render(),
+    or None if the voiceover is missing or no images came back.
+    """
+    init_vertex_ai()
+
+    if not audio_path:
+        print("❌ Error: MP3_FILE env var not set.")
+        return None
+    if not os.path.exists(audio_path):
+        print(f"❌ Error: Audio file not found: {audio_path}")
+        return None
+
+    output_dir = profile["output_dir"]
+    os.makedirs(output_dir, exist_ok=True)
+    run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_video = os.path.join(output_dir, f"youtube_shorts_{run_id}.mp4")
+    output_metadata = os.path.join(output_dir, f"youtube_metadata_{run_id}.json")
+    frames_dir = os.path.join("generated_frames", profile["name"], run_id)
+
+    print(f"Channel: {profile['channel_name']} ({profile['name']}, {profile['aspect_ratio']})")
+
+    duration = get_audio_duration(audio_path)
+    if duration <= 0:
+        return None
+
+    num_images = math.ceil(duration / IMAGE_DURATION)
+    print(f"Audio duration: {duration:.2f}s -> {num_images} segments of ~{IMAGE_DURATION:g}s")
+
+    pending = {}
+    transcript, prompts, durations_per_image, groups = generate_prompts_and_transcript_from_audio(
+        audio_path, num_images, duration, profile,
+        on_transcript=lambda t: pending.setdefault("metadata", start_metadata(t, profile)),
+    )
+
+    print(f"Generated {len(prompts)} prompts")
+
+    # parallel mode encodes each segment the moment its frame lands, overlapping Imagen
+    segments = None
+    if RENDER_MODE == "parallel" and len(durations_per_image) == sum(len(group) for group in groups):
+        segments = SegmentPipeline(durations_per_image, output_video)
+
+    def on_image(i, frame):
+        # image i covers every segment in groups[i], each with its own zoom/pan
+        for k, seg in enumerate(groups[i]):
+            segments.add(seg, frame.with_motion(k) if frame else None)
+
+    try:
+        frames = generate_images(prompts, profile, frames_dir, on_image=on_image if segments else None)
+        save_metadata_json(pending["metadata"].result(), output_metadata)
+    except Exception:
+        if segments:
+            segments.abort()
+        raise
+
+    if not frames:
+        print("❌ No images were generated. Cannot create video.")
+        if segments:
+            segments.abort()
+        return None
+
+    if len(frames) == len(groups):
+        frames = [frame.with_motion(k) for frame, group in zip(frames, groups) for k in range(len(group))]
+
+    # ensure durations list matches images list
+    if len(durations_per_image) != len(frames):
+        durations_per_image = [duration / max(1, len(frames))] * len(frames)
+
+    return {
+        "audio_path": audio_path,
+        "frames": frames,
+        "durations": durations_per_image,
+        "output_video": output_video,
+        "segments": segments,
+    }
+
+
+# -----------------------
+# STAGE 2: CPU-BOUND (zoom + encode)
+# -----------------------
+def render(job: dict) -> str:
+    if job.get("segments"):
+        return job["segments"].join(job["audio_path"])
+    create_video(job["audio_path"], job["frames"], job["output_video"], job["durations"])
+    return job["output_video"]
+
+
+def run(profile: dict, audio_path: str, run_id: str = None):
+    started = time.perf_counter()
+    job = prepare(profile, audio_path, run_id)
+    if not job:
+        return None
+    output = render(job)
+    print(f"⏱️  Total {time.perf_counter() - started:.1f}s")
+    return output
@@ -0,0 +1,67 @@
+import re
+import math
+from collections import Counter
+
+from .config import IMAGE_REUSE_MAX, IMAGE_REUSE_SIMILARITY
+
+
+# Latin words plus Devanagari (matras are combining marks, which \w alone would split on)
+_TOKEN = re.compile(r"[\w\u0900-\u097f]+")
+# filler that would otherwise make any two 5 s segments look alike (voiceovers are English or Hindi)
+_STOPWORDS = frozenset("""
+    the and for you your are was were this that these those with from have has had not but they them
+    their what when where which who how can will would should could about into over more most very just
+    also then than there here its it's our out all any some now let lets get got one like
+    है हैं के की का को में से और भी तो यह वह ये वो एक पर लिए नहीं था थे थी हम आप
+""".split())
+
+
+def _tokens(text: str):
+    return [
+        t for t in _TOKEN.findall((text or "").lower())
+        if len(t) > 1 and not t.isdigit() and t not in _STOPWORDS
+    ]
+
+
+def _tfidf_vectors(texts):
+    # one sparse {term: weight} per text; idf over this video's segments only, so words the
+    # whole script repeats (the channel's topic) count for little
+    docs = [Counter(_tokens(t)) for t in texts]
+    df = Counter(term for doc in docs for term in doc)
+    n = len(docs)
+    idf = {term: math.log((1 + n) / (1 + count)) + 1.0 for term, count in df.items()}
+    vectors = []
+    for doc in docs:
+        total = sum(doc.values()) or 1
+        vectors.append({term: count / total * idf[term] for term, count in doc.items()})
+    return vectors
+
+
+def _cosine(a: dict, b: dict) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(w * b.get(term, 0.0) for term, w in a.items())
+    if not dot:
+        return 0.0
+    return dot / (math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values())))
+
+
+def plan_image_groups(texts, threshold: float = IMAGE_REUSE_SIMILARITY, max_reuse: int = IMAGE_REUSE_MAX):
+    """
+    Groups adjacent transcript segments that say much the same thing, so one
+    image can cover them. Returns runs of segment indices, e.g. [[0], [1, 2], [3]].
+    A segment joins the current run when its TF-IDF cosine to the run so far
+    is >= threshold and the run has fewer than max_reuse segments. Segments
+    with no text (transcript parse failed) never join.
+    """
+    groups = []
+    centroid = {}
+    for i, vec in enumerate(_tfidf_vectors(texts)):
+        if groups and vec and len(groups[-1]) < max_reuse and _cosine(vec, centroid) >= threshold:
+            groups[-1].append(i)
+            for term, w in vec.items():
+                centroid[term] = centroid.get(term, 0.0) + w
+            continue
+        groups.append([i])
+        centroid = dict(vec)
+    return groups
@@ -0,0 +1,700 @@
+import io
+import os
+import json
+import math
+import time
+import shutil
+import hashlib
+import subprocess
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from PIL import Image
+
+from moviepy import AudioFileClip, VideoClip, concatenate_videoclips
+from moviepy.config import FFMPEG_BINARY
+
+from .cache import prune_lru, touch
+from .config import (
+    ENCODER, ENCODING_PROFILE, FPS, RENDER_MODE, RENDER_WORKERS, SEGMENT_CACHE_DIR, SEGMENT_CACHE_MAX_MB,
+    XFADE_SECONDS, ZOOM_QUALITY, ZOOMPAN_SUPERSAMPLE,
+)
+from .encoding import PROFILES, get_encoding_profile, x264_args, x264_tuning_args
+from .frames import Frame
+
+
+_ZOOM_FILTERS = {
+    "bilinear": Image.BILINEAR,
+    "bicubic": Image.BICUBIC,
+    "lanczos": Image.LANCZOS,
+}
+
+
+# (zoom from, zoom to, pan from, pan to) per motion. Zoom is a share of the zoom_ratio headroom
+# (1 = zoom_ratio, 0 = full frame); pan places the window in the spare width (0 = left edge,
+# 0.5 = centred). A still reused for several segments takes the next motion each time.
+MOTIONS = (
+    (1.0, 0.0, 0.5, 0.5),  # zoom out, the original move
+    (0.0, 1.0, 0.5, 0.5),  # zoom in
+    (1.0, 1.0, 0.0, 1.0),  # pan left to right
+    (1.0, 1.0, 1.0, 0.0),  # pan right to left
+)
+
+
+def _motion_at(motion: int, progress: float, zoom_ratio: float):
+    # (zoom, pan) at progress 0..1 through a segment
+    z0, z1, p0, p1 = MOTIONS[motion % len(MOTIONS)]
+    start = 1.0 + (zoom_ratio - 1.0) * z0
+    end = 1.0 + (zoom_ratio - 1.0) * z1
+    return start + (end - start) * progress, p0 + (p1 - p0) * progress
+
+
+def _still_motion(still) -> int:
+    return still.motion if isinstance(still, Frame) else 0
+
+
+def _zoom_box(w: int, h: int, zoom: float, pan: float = 0.5):
+    # source window that a zoom of `zoom` stretches over the full w x h frame
+    box_w = w / zoom
+    box_h = h / zoom
+    left = (w - box_w) * pan
+    top = (h - box_h) / 2.0
+    return (left, top, left + box_w, top + box_h)
+
+
+def _zoom_frame(img, zoom: float, resample, pan: float = 0.5) -> np.ndarray:
+    # resample only the visible window straight to output size (no full upscale + crop)
+    w, h = img.size
+    return np.asarray(img.resize((w, h), resample, box=_zoom_box(w, h, zoom, pan)))
+
+
+def _zoom_frame_around(img, zoom: float, resample, hole, out=None, pan: float = 0.5) -> np.ndarray:
+    # same as _zoom_frame, but skips the output rectangle `hole` (a caption will cover it)
+    w, h = img.size
+    left, top, right, bottom = _zoom_box(w, h, zoom, pan)
+    sx, sy = (right - left) / w, (bottom - top) / h
+    x0, y0, x1, y1 = hole
+
+    if out is None:
+        out = np.empty((h, w, 3), dtype=np.uint8)
+    for ox0, oy0, ox1, oy1 in ((0, 0, w, y0), (0, y1, w, h), (0, y0, x0, y1), (x1, y0, w, y1)):
+        if ox1 > ox0 and oy1 > oy0:
+            box = (left + ox0 * sx, top + oy0 * sy, left + ox1 * sx, top + oy1 * sy)
+            out[oy0:oy1, ox0:ox1] = np.asarray(img.resize((ox1 - ox0, oy1 - oy0), resample, box=box))
+    return out
+
+
+def _legacy_zoom_frame(frame: np.ndarray, zoom: float) -> np.ndarray:
+    # previous per-frame path, kept only as the benchmark baseline
+    h, w = frame.shape[:2]
+    current_w = int(w * zoom)
+    current_h = int(h * zoom)
+
+    img = Image.fromarray(frame)
+    img_resized = img.resize((current_w, current_h), Image.LANCZOS)
+
+    left = (current_w - w) // 2
+    top = (current_h - h) // 2
+    img_cropped = img_resized.crop((left, top, left + w, top + h))
+    return np.array(img_cropped)
+
+
+def _still_renderer(source, quality=None, size=None):
+    """
+    Decodes a still once and returns (render, (w, h)); render(zoom, out, pan)
+    fills the h x w x 3 uint8 array `out` in place. source: a Frame (background zooms,
+    caption sprite stays fixed and sharp on top) or a path to a finished image
+    (everything zooms, as before).
+    """
+    resample = _ZOOM_FILTERS.get(quality or ZOOM_QUALITY, Image.BICUBIC)
+    img = source.background() if isinstance(source, Frame) else Image.open(source).convert("RGB")
+    if size and img.size != size:
+        img = img.resize(size, resample)  # one ffmpeg stream needs one frame size
+    patch = hole = None
+    if isinstance(source, Frame):
+        patch, hole = source.sprite(img.size)
+
+    def render(zoom, out, pan=0.5):
+        if patch is None:
+            out[:] = _zoom_frame(img, zoom, resample, pan)
+            return out
+        _zoom_frame_around(img, zoom, resample, hole, out, pan)
+        out[hole[1]:hole[3], hole[0]:hole[2]] = patch
+        return out
+
+    return render, img.size
+
+
+def create_zooming_clip(source, duration, zoom_ratio=1.3, quality=None):
+    # decode once per still; every frame then only samples its visible window
+    render, (w, h) = _still_renderer(source, quality)
+    motion = _still_motion(source)
+
+    def zoom_frame(t):
+        progress = min(1.0, t / duration) if duration else 1.0
+        zoom, pan = _motion_at(motion, progress, zoom_ratio)
+        return render(zoom, np.empty((h, w, 3), dtype=np.uint8), pan)
+
+    return VideoClip(zoom_frame, duration=duration)
+
+
+def benchmark_zoom(image_path: str, seconds: float = 2.0, fps: int = 24, zoom_ratio: float = 1.3):
+    """
+    Prints frames/sec of the legacy LANCZOS upscale+crop path vs the windowed
+    engine at each quality. Run with: python -m animated --bench-zoom path/to/frame.png
+    """
+    img = Image.open(image_path).convert("RGB")
+    frame = np.array(img)
+    n = max(1, int(seconds * fps))
+    zooms = [zoom_ratio - (zoom_ratio - 1.0) * (i / n) for i in range(n)]
+
+    results = {}
+    start = time.perf_counter()
+    for z in zooms:
+        _legacy_zoom_frame(frame, z)
+    results["legacy"] = n / (time.perf_counter() - start)
+
+    for name, resample in _ZOOM_FILTERS.items():
+        start = time.perf_counter()
+        for z in zooms:
+            _zoom_frame(img, z, resample)
+        results[name] = n / (time.perf_counter() - start)
+
+    print(f"Zoom benchmark: {img.size[0]}x{img.size[1]}, {n} frames")
+    for name, rate in results.items():
+        print(f"  {name:<9} {rate:7.1f} fps  ({rate / results['legacy']:.2f}x)")
+    return results
+
+
+def _segment_frame_counts(durations, fps: int):
+    # split on cumulative time so rounding never lets the video drift from the audio
+    counts = []
+    elapsed = 0.0
+    emitted = 0
+    for d in durations:
+        elapsed += float(d)
+        n = max(1, int(round(elapsed * fps)) - emitted)
+        counts.append(n)
+        emitted += n
+    return counts
+
+
+# -----------------------
+# DIRECT FFMPEG PIPE ENCODER
+# -----------------------
+def _open_ffmpeg_pipe(size, out_path, audio_path=None, threads=None, encoding=ENCODING_PROFILE, fps=FPS,
+                      faststart=True):
+    w, h = size
+    cmd = [
+        FFMPEG_BINARY, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}", "-r", str(fps), "-i", "pipe:0",
+    ]
+    if audio_path:
+        # audio straight from the source file, no decode/re-buffer in Python
+        cmd += ["-i", audio_path, "-map", "0:v", "-map", "1:a", "-c:a", "aac"]
+    # same profile as the moviepy backend, so segments from either one concat cleanly
+    cmd += x264_args(encoding, fps, threads, faststart)
+    cmd.append(out_path)
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+
+def encode_stills(stills, frame_counts, out_path, audio_path=None, threads=None, zoom_ratio=1.3,
+                  encoding=ENCODING_PROFILE, fps=FPS, faststart=True):
+    """
+    Streams every zoom frame of every still into one ffmpeg process as raw
+    RGB, rendered into a single reusable buffer (no per-frame canvas, no
+    moviepy composition). Still i gets frame_counts[i] frames at `fps`.
+    """
+    proc = None
+    size = None
+    try:
+        for still, n_frames in zip(stills, frame_counts):
+            render, size = _still_renderer(still, size=size)
+            motion = _still_motion(still)
+            if proc is None:
+                buf = np.empty((size[1], size[0], 3), dtype=np.uint8)
+                proc = _open_ffmpeg_pipe(size, out_path, audio_path, threads, encoding, fps, faststart)
+            for i in range(n_frames):
+                zoom, pan = _motion_at(motion, i / n_frames, zoom_ratio)
+                render(zoom, buf, pan)
+                proc.stdin.write(buf.data)
+        if proc is None:
+            raise ValueError("no stills to encode")
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, FFMPEG_BINARY)
+    except BaseException:
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+        raise
+    return out_path
+
+
+def _moviepy_params(threads=None, faststart=True):
+    # write_videofile kwargs for the active profile. moviepy emits -vcodec, -preset, -threads
+    # and -pix_fmt itself, so ffmpeg_params carries only what it has no argument for
+    profile = get_encoding_profile(ENCODING_PROFILE)
+    return {
+        "codec": "libx264",
+        "preset": profile["preset"],
+        "threads": threads,
+        "ffmpeg_params": x264_tuning_args(ENCODING_PROFILE, FPS, faststart),
+    }
+
+
+def _render_segment(job):
+    # process-pool worker: encode one still's zoom segment as a standalone H.264 file.
+    # Written under a temp name and renamed, so a cache entry is never half a file
+    source, n_frames, out_path, threads = job
+    tmp_path = f"{out_path}.{os.getpid()}.tmp.mp4"
+    try:
+        if ENCODER == "pipe":
+            # no faststart: segments are only read back by the concat in join()
+            encode_stills([source], [n_frames], tmp_path, threads=threads, faststart=False)
+        else:
+            clip = create_zooming_clip(source, n_frames / FPS, zoom_ratio=1.3)
+            # +0.5 frame so moviepy's int(duration * fps) lands exactly on n_frames
+            clip = clip.with_duration((n_frames + 0.5) / FPS)
+            clip.write_videofile(tmp_path, fps=FPS, audio=False, logger=None,
+                                 **_moviepy_params(threads, faststart=False))
+            clip.close()
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return out_path
+
+
+# -----------------------
+# SEGMENT CACHE
+# -----------------------
+def _still_digest(still) -> str:
+    h = hashlib.sha256()
+    if isinstance(still, Frame):
+        h.update(still.image_bytes)
+        h.update(json.dumps([still.caption, still.position]).encode("utf-8"))
+    else:
+        with open(still, "rb") as f:
+            h.update(f.read())  # path stills are keyed on content, not name
+    return h.hexdigest()
+
+
+def _segment_cache_path(still, n_frames: int, zoom_ratio: float = 1.3):
+    # everything that changes the encoded bytes of one segment; threads don't, so they're left out
+    if not SEGMENT_CACHE_DIR:
+        return None
+    key = hashlib.sha256(json.dumps([
+        _still_digest(still), _still_motion(still), n_frames, FPS, zoom_ratio, ZOOM_QUALITY, ENCODER,
+        x264_args(ENCODING_PROFILE, FPS, faststart=False),
+    ]).encode("utf-8")).hexdigest()
+    return os.path.join(SEGMENT_CACHE_DIR, key[:2], f"{key}.mp4")
+
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _segment_pool():
+    # one pool per process, shared by every video (and every job in a batch run);
+    # spawn, because segments are submitted from Imagen worker threads and fork isn't thread-safe.
+    # A worker that dies (e.g. OOM-killed on a long segment) breaks the whole pool, so a
+    # broken one is replaced instead of failing every later job in a batch/--watch process
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None and _render_pool._broken:
+            print("⚠️  Render pool broke (a worker died); starting a fresh one")
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=max(1, RENDER_WORKERS), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _render_pool
+
+
+def _submit_segment(job):
+    try:
+        return _segment_pool().submit(_render_segment, job)
+    except BrokenProcessPool:
+        # broke between the check and the submit; the next call replaces it
+        return _segment_pool().submit(_render_segment, job)
+
+
+class SegmentPipeline:
+    """
+    Encodes each zoom segment as soon as its frame is ready, so rendering
+    overlaps image generation. add() may be called from any thread in any
+    order; segments are dispatched in timeline order. join() muxes the audio.
+    With SEGMENT_CACHE_DIR, segments already encoded by an earlier run are
+    reused as-is, so re-rendering after one changed frame encodes one segment.
+    """
+
+    def __init__(self, durations_per_image, output_path):
+        _segment_pool()  # create it here, not lazily from a worker thread
+        self.output_path = output_path
+        self.counts = _segment_frame_counts(durations_per_image, FPS)
+        self.threads = max(1, (os.cpu_count() or 1) // max(1, RENDER_WORKERS))
+        self.work_dir = tempfile.mkdtemp(prefix="segments_", dir=os.path.dirname(os.path.abspath(output_path)))
+        self._lock = threading.Lock()
+        self._arrived = {}
+        self._next = 0
+        self._last_good = None
+        self._carry = 0  # frames of leading failed images, folded into the first good one
+        self._futures = []
+        self._jobs = []  # per future: the worker job, or None for a cache hit
+        self.reused = 0
+
+    def _submit(self, idx: int, still, n_frames: int):
+        cache_path = _segment_cache_path(still, n_frames)
+        if cache_path and os.path.exists(cache_path):
+            touch(cache_path)
+            self.reused += 1
+            fut = Future()
+            fut.set_result(cache_path)
+            self._jobs.append(None)
+            return fut
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        out_path = cache_path or os.path.join(self.work_dir, f"seg_{idx:04d}.mp4")
+        job = (still, n_frames, out_path, self.threads)
+        self._jobs.append(job)
+        return _submit_segment(job)
+
+    def _result(self, fut, job):
+        try:
+            return fut.result()
+        except BrokenProcessPool:
+            # the pool died under this segment or a sibling; retry once on a fresh pool
+            print(f"⚠️  Re-encoding {os.path.basename(job[2])} after a render worker died")
+            return _submit_segment(job).result()
+
+    def add(self, i: int, still):
+        # still None = generation failed; reuse the previous good frame
+        with self._lock:
+            self._arrived[i] = still
+            while self._next in self._arrived:
+                idx = self._next
+                still = self._arrived.pop(idx) or self._last_good
+                self._next += 1
+                if not still:
+                    self._carry += self.counts[idx]
+                    continue
+                self._last_good = still
+                n_frames = self.counts[idx] + self._carry
+                self._carry = 0
+                self._futures.append(self._submit(idx, still, n_frames))
+
+    def abort(self):
+        for fut in self._futures:
+            fut.cancel()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def join(self, audio_path):
+        try:
+            if not self._futures:
+                raise RuntimeError("no segments to join")
+
+            started = time.perf_counter()
+            segment_files = [self._result(fut, job) for fut, job in zip(self._futures, self._jobs)]
+            waited = time.perf_counter() - started
+            print(f"\nAll {len(segment_files)} segments encoded (waited {waited:.1f}s after the last image)")
+
+            # every segment starts on its own keyframe, so they concat without re-encoding
+            list_path = os.path.join(self.work_dir, "segments.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                for seg in segment_files:
+                    f.write(f"file '{os.path.abspath(seg)}'\n")
+
+            print("\nJoining segments and muxing audio...")
+            subprocess.run(
+                [
+                    FFMPEG_BINARY, "-y", "-loglevel", "error",
+                    "-f", "concat", "-safe", "0", "-i", list_path,
+                    "-i", audio_path,
+                    "-map", "0:v", "-map", "1:a",
+                    "-c:v", "copy", "-c:a", "aac",
+                    *(["-movflags", "+faststart"] if get_encoding_profile(ENCODING_PROFILE)["faststart"] else []),
+                    self.output_path,
+                ],
+                check=True,
+            )
+        finally:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+        if SEGMENT_CACHE_DIR:
+            # after the concat, so this video's own segments are the most recent entries
+            kept = prune_lru(SEGMENT_CACHE_DIR, SEGMENT_CACHE_MAX_MB, ".mp4")
+            print(
+                f"✓ Segment cache: {self.reused} reused, {len(self._futures) - self.reused} encoded "
+                f"({kept / (1024 * 1024):.1f} MB in {SEGMENT_CACHE_DIR})"
+            )
+        print(f"✅ Created: {self.output_path}")
+        return self.output_path
+
+
+def create_video_parallel(audio_path, stills, output_path, durations_per_image):
+    print(f"\nRendering {len(stills)} segments on {max(1, RENDER_WORKERS)} worker(s)...")
+    segments = SegmentPipeline(durations_per_image, output_path)
+    for i, still in enumerate(stills):
+        segments.add(i, still)
+    return segments.join(audio_path)
+
+
+# -----------------------
+# PURE FFMPEG RENDER (zoompan filtergraph)
+# -----------------------
+def _still_size(still):
+    if isinstance(still, Frame):
+        return Image.open(io.BytesIO(still.image_bytes)).size  # header only
+    return Image.open(still).size
+
+
+def _ffmpeg_still_inputs(still, size, work_dir: str, i: int):
+    # (background file, caption patch file or None, caption x/y) for one still
+    if not isinstance(still, Frame):
+        return still, None, None
+    ext = ".png" if still.image_bytes[:4] == b"\x89PNG" else ".jpg"
+    background = os.path.join(work_dir, f"bg_{i:04d}{ext}")
+    with open(background, "wb") as f:
+        f.write(still.image_bytes)  # Imagen bytes as-is, no re-encode
+    patch, (x0, y0, _, _) = still.sprite(size)
+    caption = os.path.join(work_dir, f"cap_{i:04d}.png")
+    Image.fromarray(patch).save(caption)
+    return background, caption, (x0, y0)
+
+
+def _lerp_expr(a: float, b: float, d: int) -> str:
+    # a -> b over a zoompan segment of d output frames
+    if a == b:
+        return f"{a:g}"
+    return f"{a:g}{'-' if b < a else '+'}{abs(b - a):g}*on/{d}"
+
+
+def build_zoompan_graph(frame_counts, size, caption_xy, xfade_frames: int = 0, zoom_ratio: float = 1.3,
+                        supersample: int = ZOOMPAN_SUPERSAMPLE, motions=None) -> str:
+    """
+    One filtergraph for the whole video. Inputs must be ordered still 0,
+    [caption 0], still 1, [caption 1], ... with caption_xy[i] None when still i
+    has no caption input. motions[i] picks still i's MOTIONS entry (default 0).
+    With xfade_frames, every segment but the last runs that much longer and
+    overlaps the next, so the total length is unchanged.
+    """
+    w, h = size
+    n = len(frame_counts)
+    graph = []
+    labels = []
+    idx = 0
+    for i, frames in enumerate(frame_counts):
+        d = frames + (xfade_frames if i < n - 1 else 0)
+        z0, z1, p0, p1 = MOTIONS[(motions[i] if motions else 0) % len(MOTIONS)]
+        zoom = _lerp_expr(1.0 + (zoom_ratio - 1.0) * z0, 1.0 + (zoom_ratio - 1.0) * z1, d)
+        x = "iw/2-iw/zoom/2" if p0 == p1 == 0.5 else f"(iw-iw/zoom)*({_lerp_expr(p0, p1, d)})"
+        # supersampling first gives zoompan's integer crop offsets sub-pixel precision (less jitter)
+        graph.append(
+            f"[{idx}:v]scale={w * supersample}:{h * supersample},setsar=1,"
+            f"zoompan=z='{zoom}':x='{x}':y='ih/2-ih/zoom/2':d={d}:s={w}x{h}:fps={FPS}[z{i}]"
+        )
+        idx += 1
+        label = f"z{i}"
+        if caption_xy[i] is not None:
+            # caption composited after the zoom, so it stays put and sharp
+            graph.append(f"[z{i}][{idx}:v]overlay={caption_xy[i][0]}:{caption_xy[i][1]}[v{i}]")
+            idx += 1
+            label = f"v{i}"
+        labels.append(label)
+
+    if xfade_frames and n > 1:
+        prev = labels[0]
+        offset = 0
+        for i in range(1, n):
+            offset += frame_counts[i - 1]
+            graph.append(
+                f"[{prev}][{labels[i]}]xfade=transition=fade:"
+                f"duration={xfade_frames / FPS:.6f}:offset={offset / FPS:.6f}[x{i}]"
+            )
+            prev = f"x{i}"
+        last = prev
+    else:
+        graph.append("".join(f"[{label}]" for label in labels) + f"concat=n={n}:v=1:a=0[cat]")
+        last = "cat"
+
+    graph.append(f"[{last}]format=yuv420p[out]")
+    return ";\n".join(graph)
+
+
+def create_video_ffmpeg(audio_path, stills, output_path, durations_per_image, xfade: float = XFADE_SECONDS):
+    """
+    RENDER_MODE=ffmpeg: Python only writes the stills and the filtergraph; all
+    pixel work (zoom, caption overlay, transitions, encode) runs in ffmpeg.
+    """
+    size = _still_size(stills[0])
+    counts = _segment_frame_counts(durations_per_image, FPS)
+    xfade_frames = max(0, int(round(xfade * FPS)))
+    if xfade_frames:
+        # a transition can't be longer than the shorter segment it joins
+        xfade_frames = min([xfade_frames] + [c - 1 for c in counts])
+
+    work_dir = tempfile.mkdtemp(prefix="zoompan_", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        inputs = []
+        caption_xy = []
+        for i, still in enumerate(stills):
+            background, caption, xy = _ffmpeg_still_inputs(still, size, work_dir, i)
+            inputs += ["-i", background]
+            if caption:
+                inputs += ["-i", caption]
+            caption_xy.append(xy)
+        audio_index = len(inputs) // 2
+
+        graph_path = os.path.join(work_dir, "graph.txt")
+        with open(graph_path, "w", encoding="utf-8") as f:
+            f.write(build_zoompan_graph(counts, size, caption_xy, xfade_frames,
+                                        motions=[_still_motion(still) for still in stills]))
+
+        print(f"\nRendering {len(stills)} stills in one ffmpeg filtergraph (xfade {xfade_frames / FPS:.2f}s)...")
+        started = time.perf_counter()
+        subprocess.run(
+            [
+                FFMPEG_BINARY, "-y", "-loglevel", "error",
+                *inputs,
+                "-i", audio_path,
+                "-filter_complex_script", graph_path,
+                "-map", "[out]", "-map", f"{audio_index}:a",
+                *x264_args(ENCODING_PROFILE, FPS),
+                "-c:a", "aac",
+                output_path,
+            ],
+            check=True,
+        )
+        print(f"✓ ffmpeg render took {time.perf_counter() - started:.1f}s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"✅ Created: {output_path}")
+    return output_path
+
+
+def create_video(audio_path, stills, output_path, durations_per_image):
+    # stills: Frames from generate_images, or image paths
+    if RENDER_MODE == "ffmpeg":
+        return create_video_ffmpeg(audio_path, stills, output_path, durations_per_image)
+    if RENDER_MODE == "parallel" and len(stills) > 1:
+        return create_video_parallel(audio_path, stills, output_path, durations_per_image)
+
+    if ENCODER == "pipe":
+        print("\nRendering final video (direct ffmpeg pipe)...")
+        encode_stills(stills, _segment_frame_counts(durations_per_image, FPS), output_path, audio_path)
+        print(f"✅ Created: {output_path}")
+        return output_path
+
+    _encode_moviepy(audio_path, stills, output_path, durations_per_image)
+    print(f"✅ Created: {output_path}")
+    return output_path
+
+
+def _encode_moviepy(audio_path, stills, output_path, durations_per_image, logger="bar"):
+    print("\nStitching video together with zoom effects...")
+
+    # use per-image durations (sync fix)
+    clips = [
+        create_zooming_clip(still, float(d), zoom_ratio=1.3)
+        for still, d in zip(stills, durations_per_image)
+    ]
+
+    video = concatenate_videoclips(clips, method="compose")
+
+    audio = AudioFileClip(audio_path)
+    final_video = video.with_audio(audio)
+
+    print("\nRendering final video...")
+    final_video.write_videofile(output_path, fps=FPS, audio_codec="aac", logger=logger, **_moviepy_params())
+
+    audio.close()
+    final_video.close()
+
+
+def benchmark_encoders(image_path: str, minutes: float = 5.0, seconds_per_image: float = 5.0):
+    """
+    Side-by-side: the moviepy compose + write_videofile path vs encode_stills,
+    single process each, on a stills-plus-audio job of `minutes` length.
+    Run with: python -m animated --bench-encode path/to/frame.png [--minutes 5]
+    """
+    total = minutes * 60.0
+    n = max(1, math.ceil(total / seconds_per_image))
+    durations = [seconds_per_image] * (n - 1) + [total - seconds_per_image * (n - 1)]
+    stills = [image_path] * n
+    frames = sum(_segment_frame_counts(durations, FPS))
+
+    work_dir = tempfile.mkdtemp(prefix="encode_bench_")
+    try:
+        audio_path = os.path.join(work_dir, "silence.wav")
+        subprocess.run(
+            [FFMPEG_BINARY, "-y", "-loglevel", "error", "-f", "lavfi", "-i", "anullsrc=r=24000:cl=mono",
+             "-t", f"{total:.3f}", audio_path],
+            check=True,
+        )
+
+        results = {}
+        for name in ("moviepy", "pipe"):
+            out_path = os.path.join(work_dir, f"{name}.mp4")
+            start = time.perf_counter()
+            if name == "pipe":
+                encode_stills(stills, _segment_frame_counts(durations, FPS), out_path, audio_path)
+            else:
+                _encode_moviepy(audio_path, stills, out_path, durations, logger=None)
+            elapsed = time.perf_counter() - start
+            results[name] = (elapsed, frames / elapsed, os.path.getsize(out_path))
+            print(f"  {name:<8} {elapsed:7.1f}s  {frames / elapsed:6.1f} fps  {os.path.getsize(out_path) / 1e6:6.1f} MB")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    size = Image.open(image_path).size
+    print(f"Encoder benchmark: {size[0]}x{size[1]}, {minutes:g} min, {n} stills, {frames} frames")
+    print(f"  pipe is {results['moviepy'][0] / results['pipe'][0]:.2f}x faster than moviepy")
+    return results
+
+
+def benchmark_profiles(image_path: str, minutes: float = 1.0, seconds_per_image: float = 5.0):
+    """
+    Encode time vs file size for every encoding profile on one zoomed still
+    with silent audio, through the default pipe encoder. Each profile renders
+    at its own fps. Run with: python -m animated --bench-profiles frame.png --minutes 1
+    """
+    total = minutes * 60.0
+    n = max(1, math.ceil(total / seconds_per_image))
+    durations = [seconds_per_image] * (n - 1) + [total - seconds_per_image * (n - 1)]
+    stills = [image_path] * n
+
+    work_dir = tempfile.mkdtemp(prefix="profile_bench_")
+    try:
+        audio_path = os.path.join(work_dir, "silence.wav")
+        subprocess.run(
+            [FFMPEG_BINARY, "-y", "-loglevel", "error", "-f", "lavfi", "-i", "anullsrc=r=24000:cl=mono",
+             "-t", f"{total:.3f}", audio_path],
+            check=True,
+        )
+
+        size = Image.open(image_path).size
+        print(f"Profile benchmark: {size[0]}x{size[1]}, {minutes:g} min, {n} stills")
+        print(f"  {'profile':<8} {'fps':>4} {'frames':>7} {'encode':>9} {'x realtime':>10} {'size':>9} {'video':>11}")
+        results = {}
+        for name, profile in PROFILES.items():
+            counts = _segment_frame_counts(durations, profile["fps"])
+            out_path = os.path.join(work_dir, f"{name}.mp4")
+            start = time.perf_counter()
+            encode_stills(stills, counts, out_path, audio_path, encoding=name, fps=profile["fps"])
+            elapsed = time.perf_counter() - start
+            mb = os.path.getsize(out_path) / 1e6
+            results[name] = (elapsed, mb)
+            print(
+                f"  {name:<8} {profile['fps']:>4} {sum(counts):>7} {elapsed:8.1f}s {total / elapsed:9.2f}x "
+                f"{mb:7.1f} MB {mb * 8000 / total:6.0f} kb/s"
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
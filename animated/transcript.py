@@ -0,0 +1,284 @@
+import re
+
+from .audio import _build_audio_part, _ingest_audio
+from .config import IMAGE_DURATION, IMAGE_REUSE_MAX, IMAGE_REUSE_SIMILARITY, get_gemini_model
+from .planning import plan_image_groups
+
+
+# -----------------------
+# TRANSCRIPT PARSING
+# -----------------------
+def _parse_timestamp(s: str) -> float:
+    # "0:05" -> 5.0, "1:02:03.5" -> 3723.5 (comma decimals accepted)
+    seconds = 0.0
+    for part in s.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _format_mmss(seconds: float) -> str:
+    seconds = max(0, int(round(seconds)))
+    m = seconds // 60
+    s = seconds % 60
+    return f"{m}:{s:02d}"
+
+
+_TS = r"(?:\d{1,2}:)?\d{1,3}:\d{2}(?:[.,]\d{1,3})?"
+# [0:00-0:05] text / (1:02:03.5 – 1:02:08) text / **0:05 to 0:10:** text / 0:10 --> 0:15 text
+_TS_RANGE_LINE = re.compile(
+    rf"^[\s*_>#-]*[\[(]?\s*({_TS})\s*(?:-{{1,2}}>?|–|—|to)\s*({_TS})\s*[\])]?[\s*_:–—-]*(.*)$",
+    re.IGNORECASE,
+)
+# [0:10] text  (start only; ends where the next timestamp starts)
+_TS_POINT_LINE = re.compile(rf"^[\s*_>#-]*[\[(]\s*({_TS})\s*[\])][\s*_:–—-]*(.*)$")
+
+
+def _iter_timestamp_chunks(lines, stats=None):
+    """
+    Streams (start, end, text) tuples out of transcript lines, accepting
+    h:mm:ss(.ms) stamps and the bracket / dash / markdown variants Gemini emits.
+    If `stats` is a dict, its "lines" and "parsed" counters are updated.
+    """
+    pending = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if stats is not None:
+            stats["lines"] += 1
+
+        m = _TS_RANGE_LINE.match(line)
+        if m:
+            start, end, text = _parse_timestamp(m.group(1)), _parse_timestamp(m.group(2)), m.group(3)
+        else:
+            m = _TS_POINT_LINE.match(line)
+            if not m:
+                continue
+            start, end, text = _parse_timestamp(m.group(1)), None, m.group(2)
+
+        if pending is not None:
+            if start > pending[0]:
+                if stats is not None:
+                    stats["parsed"] += 1
+                yield pending[0], start, pending[1]
+            pending = None
+
+        text = text.strip(" *_")
+        if end is None:
+            pending = (start, text)
+            continue
+        if end <= start:
+            continue
+        if stats is not None:
+            stats["parsed"] += 1
+        yield start, end, text
+
+    if pending is not None:
+        if stats is not None:
+            stats["parsed"] += 1
+        yield pending[0], pending[0] + IMAGE_DURATION, pending[1]
+
+
+def _extract_timestamp_chunks(transcript: str):
+    stats = {"lines": 0, "parsed": 0}
+    chunks = list(_iter_timestamp_chunks((transcript or "").splitlines(), stats))
+
+    coverage = 100.0 * stats["parsed"] / stats["lines"] if stats["lines"] else 0.0
+    print(f"✓ Timestamp coverage: {stats['parsed']}/{stats['lines']} lines ({coverage:.0f}%)")
+    if coverage < 80:
+        print("⚠️  Low timestamp coverage; image/voice sync is degraded")
+    return chunks
+
+
+def _segments_from_chunks(chunks, audio_duration: float, target_n: int):
+    """
+    Build exactly target_n segments with (start,end,text) by time-windowing.
+    Windows are uniform, so each transcript word is placed by arithmetic on its
+    time instead of scanning every chunk per window (linear in words + windows).
+    A chunk straddling a boundary has its words split in proportion to the
+    overlap rather than repeated in both windows.
+    If transcript parsing fails, falls back to uniform windows (empty text).
+    """
+    if target_n <= 0:
+        return []
+
+    seg_len = audio_duration / target_n if audio_duration > 0 else IMAGE_DURATION
+    segs = []
+    for i in range(target_n):
+        st = i * seg_len
+        en = min(audio_duration, (i + 1) * seg_len)
+        if i == target_n - 1 and audio_duration > 0:
+            en = audio_duration
+        segs.append({"start": st, "end": en, "text": ""})
+
+    timeline_end = segs[-1]["end"]
+    texts = [[] for _ in range(target_n)]
+    for start, end, text in chunks:
+        words = text.split()
+        span = end - start
+        for k, word in enumerate(words):
+            # word k sits at its proportional position inside the chunk's time range
+            t = start + span * (k + 0.5) / len(words)
+            if t >= timeline_end:
+                break
+            texts[min(int(t / seg_len), target_n - 1)].append(word)
+
+    for seg, words in zip(segs, texts):
+        seg["text"] = " ".join(words)
+    return segs
+
+
+# -----------------------
+# PROMPTS
+# -----------------------
+def transcribe_audio_with_timestamps(audio_part, model) -> str:
+    transcript_prompt = (
+        "Transcribe this audio with approximate timestamps ~5 seconds each. "
+        "Format exactly per line: [0:00-0:05] text here"
+    )
+    transcript_response = model.generate_content([audio_part, transcript_prompt])
+    return (transcript_response.text or "").strip()
+
+
+def _clean_model_lines(text: str):
+    lines = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        # remove leading numbering like "1. "
+        line = re.sub(r"^\d+\.\s*", "", line).strip()
+        lines.append(line)
+    return lines
+
+
+def _fallback_overlay_english(segment_text: str) -> str:
+    # If Gemini fails, still produce something in English
+    if not segment_text:
+        return "Key update"
+    # crude, but guarantees English output format; better overlay comes from Gemini.
+    return "Key update"
+
+
+def generate_prompts_from_transcript_segments(segments, audio_part, model, num_images: int, profile: dict):
+    """
+    Returns:
+      prompts_with_text: list[str] each like: "<image prompt> [TEXT: <english overlay>]"
+    """
+    # Build input for Gemini so it can make distinct prompts PER segment.
+    seg_lines = []
+    for i, seg in enumerate(segments):
+        seg_lines.append(f"{i} ||| {_format_mmss(seg['start'])}-{_format_mmss(seg['end'])} ||| {seg.get('text','')}")
+    seg_block = "\n".join(seg_lines)
+
+    prompt_text = f"""
+You are generating visuals for a {profile["content_type"]} video.
+
+You will receive {num_images} segments, each containing:
+index ||| timestamp ||| spoken text (may be Hindi).
+
+Task:
+- For EACH segment, create:
+  1) A distinct image generation prompt that matches the meaning of that segment.
+  2) An English text overlay (translate/summarize into English), 3 to 8 words max.
+
+Output EXACTLY {num_images} lines.
+Each line must be EXACTLY:
+index ||| image_prompt ||| text_overlay_english
+
+Rules:
+- The image_prompt must be different for each segment (no repetition).
+- text_overlay_english must ALWAYS be English.
+- Visual style: vibrant {profile["scene_style"]} aesthetic.
+- Avoid generic "stock market" unless the segment actually discusses markets.
+- No extra commentary, no markdown.
+
+Segments:
+{seg_block}
+"""
+
+    resp = model.generate_content([audio_part, prompt_text])
+    lines = _clean_model_lines(resp.text)
+
+    by_idx = {}
+    for line in lines:
+        parts = [p.strip() for p in line.split("|||")]
+        if len(parts) < 3:
+            continue
+        try:
+            idx = int(parts[0])
+        except Exception:
+            continue
+        img_prompt = parts[1]
+        overlay_en = "|||".join(parts[2:]).strip()
+        if img_prompt:
+            by_idx[idx] = (img_prompt, overlay_en)
+
+    prompts_with_text = []
+    for i in range(num_images):
+        if i in by_idx:
+            img_prompt, overlay_en = by_idx[i]
+            overlay_en = overlay_en.strip()
+            if not overlay_en:
+                overlay_en = _fallback_overlay_english(segments[i].get("text", ""))
+            prompts_with_text.append(f"{img_prompt} [TEXT: {overlay_en}]")
+        else:
+            # fallback per segment: still unique-ish by including segment text
+            base = segments[i].get("text", "").strip()
+            img_prompt = (
+                f"Vibrant cinematic {profile['scene_style']} scene illustrating: {base[:160]}"
+                if base else
+                f"Vibrant cinematic {profile['scene_style']} scene, documentary style, high detail"
+            )
+            prompts_with_text.append(f"{img_prompt} [TEXT: {_fallback_overlay_english(base)}]")
+
+    return prompts_with_text
+
+
+def generate_prompts_and_transcript_from_audio(audio_path: str, num_images: int, audio_duration: float, profile: dict,
+                                               on_transcript=None):
+    print(f"Uploading and analyzing: {audio_path}...")
+
+    model = get_gemini_model()
+
+    audio_data, mime_type = _ingest_audio(audio_path)
+    audio_part = _build_audio_part(audio_data, mime_type)
+
+    transcript = transcribe_audio_with_timestamps(audio_part, model)
+    print(f"\n📝 Transcript:\n{transcript}\n")
+    if on_transcript:
+        on_transcript(transcript)
+
+    chunks = _extract_timestamp_chunks(transcript)
+    segments = _segments_from_chunks(chunks, audio_duration, num_images)
+
+    # one prompt (and one Imagen call) per group of near-identical adjacent segments
+    groups = plan_image_groups([seg["text"] for seg in segments])
+    planned = [
+        {
+            "start": segments[group[0]]["start"],
+            "end": segments[group[-1]]["end"],
+            "text": " ".join(segments[i]["text"] for i in group).strip(),
+        }
+        for group in groups
+    ]
+    print(
+        f"✓ Image plan: {len(segments)} segments -> {len(planned)} images "
+        f"({len(segments) - len(planned)} Imagen calls saved; similarity >= {IMAGE_REUSE_SIMILARITY:g}, "
+        f"up to {IMAGE_REUSE_MAX} segments per image)"
+    )
+
+    prompts = generate_prompts_from_transcript_segments(planned, audio_part, model, len(planned), profile)
+
+    # durations per segment for exact sync
+    durations = []
+    for seg in segments:
+        d = max(0.1, float(seg["end"] - seg["start"]))
+        durations.append(d)
+
+    # fix rounding drift so sum(durations) == audio_duration (if known)
+    if audio_duration > 0 and durations:
+        drift = audio_duration - sum(durations)
+        durations[-1] = max(0.1, durations[-1] + drift)
+
+    return transcript, prompts, durations, groups
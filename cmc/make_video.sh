@@ -20,12 +20,16 @@ if [ ! -f "$AUDIO" ]; then
   exit 1
 fi
 
-echo "🎞️ Creating video directly with FFmpeg (no temp files)..."
+# x264 flags come from the shared encoding profiles (animated/encoding.py); 1 = this script's frame rate
+ENCODING_PROFILE=${ENCODING_PROFILE:-draft}
+ENC_ARGS=$(python3 "$(dirname "$0")/../animated/encoding.py" "$ENCODING_PROFILE" 1)
+
+echo "🎞️ Creating video directly with FFmpeg (no temp files, $ENCODING_PROFILE profile)..."
 
 # Key optimizations:
 # 1. Avoid separate temp encodes — merge video/audio in one pass.
 # 2. Use -shortest only when needed.
-# 3. Use ultrafast preset & tune stillimage for static content.
+# 3. Use the draft profile (ultrafast preset & tune stillimage) for static content.
 # 4. Use filter_complex for fade and looping inline.
 
 ffmpeg -y \
@@ -35,10 +39,8 @@ ffmpeg -y \
   -filter_complex "[0:v]fade=t=in:st=0:d=3,fade=t=out:st=$(($DURATION - 3)):d=3,format=yuv420p[v]; \
                    [1:a]afade=t=in:st=0:d=3,afade=t=out:st=$(($DURATION - 3)):d=3[a]" \
   -map "[v]" -map "[a]" \
-  -preset ultrafast -tune stillimage \
-  -c:v libx264 -pix_fmt yuv420p \
+  $ENC_ARGS \
   -c:a aac -b:a 192k \
-  -movflags +faststart \
   "$OUTPUT"
 
 echo "✅ Done! Video saved as: $OUTPUT"
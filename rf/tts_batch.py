@@ -0,0 +1,275 @@
+import argparse
+import base64
+import json
+import os
+import re
+import struct
+import subprocess
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Usage:
+#   export PROJECT_ID="your-gcp-project-id"
+#   python rf/tts_batch.py --in rf/input/tax.txt --out rf/input/voiceover.wav
+#   python rf/tts_batch.py --in rf/input/tax.txt --out /tmp/out.wav --mock   # local fake endpoint, no auth
+#   python rf/tts_batch.py --in rf/input/tax.txt --out /dev/null --bench      # chunker vs old shell loop
+#
+# One ADC token and one HTTP session are shared by every chunk; chunks are
+# synthesized concurrently and spliced in order into a single WAV (no re-encode).
+
+TTS_ENDPOINT = "https://texttospeech.googleapis.com/v1/text:synthesize"
+DEFAULT_PROMPT = "Energetic Hindi financial narrator. Clear, fast-paced. Emphasize numbers. Short pauses."
+
+# split *after* a sentence terminator (incl. Devanagari danda) that is followed by whitespace, or after a newline
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?।॥])(?=\s)|(?<=\n)")
+_WORD_BREAK = re.compile(r"(?<=\s)(?=\S)")
+
+# the splitter tts_file.sh used before this driver, kept for --bench
+_LEGACY_SHELL_SPLIT = r"""
+i=0; buf=""
+while IFS= read -r line || [[ -n "$line" ]]; do
+  candidate="${buf}${line}"$'\n'
+  if (( $(printf %s "$candidate" | wc -c) > MAX_BYTES )); then
+    i=$((i+1)); buf="${line}"$'\n'
+  else
+    buf="$candidate"
+  fi
+done < "$IN"
+echo $((i+1))
+"""
+
+def _split_oversized(piece: str, max_bytes: int):
+    # sentence longer than the budget: fall back to word boundaries, then UTF-8 char boundaries
+    for word in _WORD_BREAK.split(piece):
+        raw = word.encode("utf-8")
+        while len(raw) > max_bytes:
+            cut = max_bytes
+            while cut > 0 and (raw[cut] & 0xC0) == 0x80:
+                cut -= 1
+            yield raw[:cut].decode("utf-8")
+            raw = raw[cut:]
+        if raw:
+            yield raw.decode("utf-8")
+
+def chunk_text(text: str, max_bytes: int) -> list[str]:
+    """
+    Single pass over the text: pieces end at sentence boundaries (. ! ? । ॥ or
+    newline) and are packed greedily under max_bytes of UTF-8. Each piece's byte
+    length is computed once, so this is linear in the input size.
+    """
+    chunks = []
+    buf = []
+    buf_bytes = 0
+    for sentence in _SENTENCE_BREAK.split(text):
+        n = len(sentence.encode("utf-8"))
+        pieces = [(sentence, n)] if n <= max_bytes else [
+            (p, len(p.encode("utf-8"))) for p in _split_oversized(sentence, max_bytes)
+        ]
+        for piece, piece_bytes in pieces:
+            if buf and buf_bytes + piece_bytes > max_bytes:
+                chunks.append("".join(buf))
+                buf = []
+                buf_bytes = 0
+            buf.append(piece)
+            buf_bytes += piece_bytes
+    if buf:
+        chunks.append("".join(buf))
+    return [c for c in chunks if c.strip()]
+
+def bench_chunker(in_file: str, max_bytes: int, min_kb: int = 300):
+    # repeat the script up to min_kb so the comparison runs on a long-form sized input
+    with open(in_file, "r", encoding="utf-8") as f:
+        text = f.read()
+    reps = max(1, (min_kb * 1024) // max(1, len(text.encode("utf-8"))) + 1)
+    big = text * reps
+    big_path = f"{in_file}.bench.tmp"
+    with open(big_path, "w", encoding="utf-8") as f:
+        f.write(big)
+
+    try:
+        started = time.perf_counter()
+        chunks = chunk_text(big, max_bytes)
+        py_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        out = subprocess.run(
+            ["bash", "-c", _LEGACY_SHELL_SPLIT],
+            env={**os.environ, "IN": big_path, "MAX_BYTES": str(max_bytes)},
+            capture_output=True, text=True, check=True,
+        )
+        sh_s = time.perf_counter() - started
+    finally:
+        os.remove(big_path)
+
+    print(f"Input: {len(big.encode('utf-8')) / 1024:.0f} KB, budget {max_bytes} bytes")
+    print(f"  chunk_text     {py_s * 1000:9.1f} ms  {len(chunks)} chunks (max {max(len(c.encode('utf-8')) for c in chunks)} bytes)")
+    print(f"  tts_file.sh    {sh_s * 1000:9.1f} ms  {out.stdout.strip()} chunks")
+    print(f"  speedup        {sh_s / max(py_s, 1e-9):9.1f}x")
+
+def build_request(text: str, model: str, voice: str, prompt: str) -> dict:
+    # Gemini-TTS supports input.prompt; non-Gemini voices do not (mirrors rf/tts.sh)
+    if model.startswith("gemini-"):
+        return {
+            "input": {"prompt": prompt, "text": text},
+            "voice": {"languageCode": "en-us", "name": voice, "model_name": model},
+            "audioConfig": {"audioEncoding": "LINEAR16"},
+        }
+    return {
+        "input": {"text": text},
+        "voice": {"languageCode": "hi-IN", "name": voice},
+        "audioConfig": {"audioEncoding": "LINEAR16"},
+    }
+
+def _wav_header(data_size: int, sample_rate: int, bits_per_sample: int, num_channels: int) -> bytes:
+    block_align = num_channels * (bits_per_sample // 8)
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1,
+        num_channels, sample_rate, sample_rate * block_align, block_align, bits_per_sample,
+        b"data", data_size
+    )
+
+def _split_wav(wav: bytes):
+    # -> (pcm, (sample_rate, bits_per_sample, channels))
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(wav):
+        chunk_id, chunk_size = struct.unpack("<4sI", wav[pos:pos + 8])
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            _, channels, rate, _, _, bits = struct.unpack("<HHIIHH", wav[body:body + 16])
+            fmt = (rate, bits, channels)
+        elif chunk_id == b"data":
+            if fmt is None:
+                break
+            return wav[body:body + chunk_size], fmt
+        pos = body + chunk_size + (chunk_size & 1)
+    raise RuntimeError("TTS response is not a PCM WAV.")
+
+def open_session(endpoint: str, project: str, concurrency: int, use_auth: bool = True) -> requests.Session:
+    session = requests.Session()
+    session.mount(endpoint.split("/", 3)[0] + "//", HTTPAdapter(pool_maxsize=max(1, concurrency)))
+    session.headers["Content-Type"] = "application/json; charset=utf-8"
+    if use_auth:
+        # one ADC token for the whole batch instead of one gcloud call per chunk
+        import google.auth
+        from google.auth.transport.requests import Request
+
+        creds, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+        creds.refresh(Request())
+        session.headers["Authorization"] = f"Bearer {creds.token}"
+        session.headers["x-goog-user-project"] = project
+    return session
+
+def synthesize(session: requests.Session, endpoint: str, body: dict) -> bytes:
+    resp = session.post(endpoint, data=json.dumps(body), timeout=300)
+    data = resp.json()
+    if "error" in data:
+        raise RuntimeError(f"TTS API error: {json.dumps(data['error'])}")
+    audio_b64 = (data.get("audioContent") or "").strip()
+    if not audio_b64:
+        raise RuntimeError(f"No audioContent in response: {json.dumps(data)[:500]}")
+    return base64.b64decode(audio_b64)
+
+def synthesize_to_wav(chunks, out_wav: str, session, endpoint: str, model: str, voice: str,
+                      prompt: str, concurrency: int) -> float:
+    """
+    Synthesizes chunks concurrently (at most `concurrency` in flight) and splices
+    their PCM into out_wav in chunk order as results arrive. Returns seconds of audio.
+    """
+    def job(i_text):
+        i, text = i_text
+        started = time.perf_counter()
+        wav = synthesize(session, endpoint, build_request(text, model, voice, prompt))
+        print(f"  ✓ chunk {i + 1}/{len(chunks)} ({len(text.encode('utf-8'))} bytes) in {time.perf_counter() - started:.1f}s")
+        return wav
+
+    os.makedirs(os.path.dirname(out_wav) or ".", exist_ok=True)
+    fmt = None
+    data_size = 0
+    with open(out_wav, "wb") as f, ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        f.write(b"\0" * 44)  # header patched once the total size is known
+        for wav in pool.map(job, enumerate(chunks)):
+            pcm, chunk_fmt = _split_wav(wav)
+            if fmt is None:
+                fmt = chunk_fmt
+            elif chunk_fmt != fmt:
+                raise RuntimeError(f"Chunk audio format {chunk_fmt} differs from {fmt}; cannot splice.")
+            f.write(pcm)
+            data_size += len(pcm)
+        if fmt is None:
+            raise RuntimeError("No chunks to synthesize.")
+        rate, bits, channels = fmt
+        f.seek(0)
+        f.write(_wav_header(data_size, rate, bits, channels))
+
+    return data_size / (rate * channels * (bits // 8))
+
+class _MockTTSHandler(BaseHTTPRequestHandler):
+    # Local stand-in for text:synthesize: 10 ms of a flat level per input byte, the level
+    # keyed to the text so a spliced file shows whether chunks landed in order
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        text = body.get("input", {}).get("text", "").encode("utf-8")
+        pcm = struct.pack("<h", zlib.crc32(text) & 0x3fff) * (240 * len(text))
+        wav = _wav_header(len(pcm), 24000, 16, 1) + pcm
+        payload = json.dumps({"audioContent": base64.b64encode(wav).decode("ascii")}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def start_mock_server() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockTTSHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1/text:synthesize"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in", dest="in_file", required=True)
+    ap.add_argument("--out", dest="out_wav", required=True)
+    ap.add_argument("--project", default=os.environ.get("PROJECT_ID"))
+    ap.add_argument("--model", default=os.environ.get("MODEL_NAME", "gemini-2.5-pro-preview-tts"))
+    ap.add_argument("--voice", default=os.environ.get("VOICE_NAME", "sadaltager"))
+    ap.add_argument("--prompt", default=DEFAULT_PROMPT)
+    ap.add_argument("--max-bytes", type=int, default=int(os.environ.get("MAX_BYTES", "3000")))
+    ap.add_argument("--concurrency", type=int, default=int(os.environ.get("TTS_CONCURRENCY", "4")))
+    ap.add_argument("--endpoint", default=TTS_ENDPOINT)
+    ap.add_argument("--mock", action="store_true", help="synthesize against a local fake endpoint")
+    ap.add_argument("--bench", action="store_true", help="benchmark the chunker against the old shell loop")
+    args = ap.parse_args()
+
+    if args.bench:
+        bench_chunker(args.in_file, args.max_bytes)
+        return
+
+    if not args.mock and not args.project:
+        ap.error("Set PROJECT_ID or pass --project")
+
+    with open(args.in_file, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    chunks = chunk_text(text, args.max_bytes)
+    endpoint = start_mock_server() if args.mock else args.endpoint
+    session = open_session(endpoint, args.project, args.concurrency, use_auth=not args.mock)
+
+    print(f"Synthesizing {len(chunks)} chunk(s), {args.concurrency} at a time...")
+    started = time.perf_counter()
+    seconds = synthesize_to_wav(
+        chunks, args.out_wav, session, endpoint, args.model, args.voice, args.prompt, args.concurrency
+    )
+    print(f"Saved: {args.out_wav} ({seconds:.1f}s of audio in {time.perf_counter() - started:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# the engine and the channel scripts are run from the repo root, not installed
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
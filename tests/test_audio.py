@@ -0,0 +1,91 @@
+import hashlib
+
+import pytest
+
+pytest.importorskip("vertexai")
+pytest.importorskip("google.cloud.storage")
+
+from animated import audio
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+
+    def exists(self):
+        return self.name in self.bucket.objects
+
+    def upload_from_string(self, data, content_type):
+        self.bucket.uploads.append(self.name)
+        self.bucket.objects[self.name] = (data, content_type)
+
+
+class FakeBucket:
+    def __init__(self, name):
+        self.name = name
+        self.objects = {}
+        self.uploads = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+class FakeStorageClient:
+    """In-memory stand-in for storage.Client: one bucket per name, shared across clients."""
+
+    buckets = {}
+
+    def bucket(self, name):
+        return self.buckets.setdefault(name, FakeBucket(name))
+
+
+class FakePart:
+    @staticmethod
+    def from_uri(uri, mime_type):
+        return ("uri", uri, mime_type)
+
+    @staticmethod
+    def from_data(data, mime_type):
+        return ("data", data, mime_type)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    FakeStorageClient.buckets = {}
+    monkeypatch.setattr(audio.storage, "Client", FakeStorageClient)
+    monkeypatch.setattr(audio, "Part", FakePart)
+    monkeypatch.setattr(audio, "AUDIO_UPLOAD_BUCKET", "voiceovers")
+    monkeypatch.setattr(audio, "INLINE_AUDIO_MAX_MB", 1)
+    return FakeStorageClient.buckets
+
+
+BIG = b"\x01\x02" * (1024 * 1024)  # 2 MB
+
+
+def test_large_audio_is_uploaded_and_referenced_by_uri(store):
+    part = audio._build_audio_part(BIG, "audio/wav")
+
+    digest = hashlib.sha256(BIG).hexdigest()
+    assert part == ("uri", f"gs://voiceovers/audio/{digest}", "audio/wav")
+    assert store["voiceovers"].objects[f"audio/{digest}"] == (BIG, "audio/wav")
+
+
+def test_second_run_reuses_the_uploaded_blob(store):
+    first = audio._build_audio_part(BIG, "audio/wav")
+    second = audio._build_audio_part(BIG, "audio/wav")
+
+    assert first == second
+    assert store["voiceovers"].uploads == [f"audio/{hashlib.sha256(BIG).hexdigest()}"]
+
+
+def test_small_audio_stays_inline(store):
+    small = b"\x00" * 1024
+    assert audio._build_audio_part(small, "audio/mpeg") == ("data", small, "audio/mpeg")
+    assert store == {}
+
+
+def test_without_a_bucket_large_audio_stays_inline(store, monkeypatch):
+    monkeypatch.setattr(audio, "AUDIO_UPLOAD_BUCKET", None)
+    assert audio._build_audio_part(BIG, "audio/wav") == ("data", BIG, "audio/wav")
+    assert store == {}
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+pytest.importorskip("vertexai")
+
+from animated import batch
+
+
+def test_watch_fails_bad_job_files_and_keeps_serving(tmp_path, monkeypatch):
+    (tmp_path / "a_missing_key.json").write_text(json.dumps({"channel": "rf"}))
+    (tmp_path / "b_not_an_object.json").write_text(json.dumps(["rf", "voice.mp3"]))
+    (tmp_path / "c_not_json.json").write_text("{")
+    (tmp_path / "d_good.json").write_text(json.dumps({"channel": "rf", "audio": "voice.mp3"}))
+
+    monkeypatch.setattr(batch, "prepare", lambda profile, audio, run_id: {"audio_path": audio})
+    monkeypatch.setattr(batch, "render", lambda job: "out.mp4")
+    polls = []
+
+    def sleep(_):
+        polls.append(1)
+        if len(polls) == 2:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(batch.time, "sleep", sleep)
+    batch.watch(str(tmp_path), api_workers=1)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "a_missing_key.json.failed",
+        "b_not_an_object.json.failed",
+        "c_not_json.json.failed",
+        "d_good.json.done",
+    ]
+    assert len(polls) == 2  # still polling after the bad files
+
+
+def test_load_jobs_rejects_malformed_lines(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text('# comment\n{"channel": "rf", "audio": "a.mp3"}\n\n')
+    assert batch.load_jobs(str(path)) == [("rf", "a.mp3")]
+
+    path.write_text('{"channel": "rf"}\n')
+    with pytest.raises(ValueError):
+        batch.load_jobs(str(path))
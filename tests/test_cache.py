@@ -0,0 +1,47 @@
+import os
+
+from animated.cache import prune_lru, touch
+
+
+def _entry(path, size, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_prune_evicts_least_recently_used_first(tmp_path):
+    old = _entry(tmp_path / "aa" / "old.png", 400_000, 1_000)
+    mid = _entry(tmp_path / "bb" / "mid.png", 400_000, 2_000)
+    new = _entry(tmp_path / "aa" / "new.png", 400_000, 3_000)
+
+    kept = prune_lru(str(tmp_path), 1, ".png")
+
+    assert kept == 800_000
+    assert not old.exists()
+    assert mid.exists() and new.exists()
+
+
+def test_touch_protects_an_entry_from_eviction(tmp_path):
+    old = _entry(tmp_path / "old.mp4", 600_000, 1_000)
+    new = _entry(tmp_path / "new.mp4", 600_000, 2_000)
+
+    touch(str(old))
+    prune_lru(str(tmp_path), 1, ".mp4")
+
+    assert old.exists()
+    assert not new.exists()
+
+
+def test_prune_ignores_other_suffixes_and_temp_files(tmp_path):
+    other = _entry(tmp_path / "notes.txt", 2_000_000, 1_000)
+    tmp = _entry(tmp_path / "seg.mp4.123.tmp.mp4", 2_000_000, 1_000)
+    entry = _entry(tmp_path / "seg.mp4", 100, 2_000)
+
+    assert prune_lru(str(tmp_path), 1, ".mp4") == 100
+    assert other.exists() and tmp.exists() and entry.exists()
+
+
+def test_prune_without_a_cache_dir_keeps_nothing(tmp_path):
+    assert prune_lru("", 1, ".png") == 0
+    assert prune_lru(str(tmp_path / "missing"), 1, ".png") == 0
@@ -0,0 +1,172 @@
+import io
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("vertexai")
+from PIL import Image
+
+from animated import images
+
+
+def _png(color) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 56), color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+class _Generated:
+    def __init__(self, data: bytes):
+        self._image_bytes = data
+
+
+class FakeImagenModel:
+    """Stands in for ImageGenerationModel: one solid PNG per prompt, scripted failures."""
+
+    def __init__(self, fail=None, delays=None):
+        self.fail = dict(fail or {})  # prompt -> list of exceptions, raised one per call
+        self.delays = delays or {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def generate_images(self, prompt, number_of_images, aspect_ratio, add_watermark):
+        with self.lock:
+            self.calls.append(prompt)
+            errors = self.fail.get(prompt)
+            error = errors.pop(0) if errors else None
+        time.sleep(self.delays.get(prompt, 0))
+        if error:
+            raise error
+        return [_Generated(_png((len(prompt) * 10 % 255, 80, 160)))]
+
+
+class RecordingBucket:
+    def __init__(self):
+        self.acquired = 0
+        self.backoffs = []
+
+    def acquire(self):
+        self.acquired += 1
+
+    def back_off(self, seconds):
+        self.backoffs.append(seconds)
+
+
+@pytest.fixture
+def imagen(monkeypatch):
+    def install(model):
+        bucket = RecordingBucket()
+        monkeypatch.setattr(images, "_load_imagen_model", lambda: (model, "fake-imagen"))
+        monkeypatch.setattr(images, "_imagen_bucket", lambda: bucket)
+        monkeypatch.setattr(images, "IMAGE_CACHE_DIR", "")
+        monkeypatch.setattr(images, "SAVE_FRAMES", False)
+        return bucket
+    return install
+
+
+PROFILE = {"aspect_ratio": "9:16", "caption_position": "bottom"}
+
+
+def test_frames_come_back_in_prompt_order(imagen):
+    prompts = [f"scene {i} [TEXT: caption {i}]" for i in range(6)]
+    # later prompts finish first
+    imagen(FakeImagenModel(delays={p: 0.05 * (6 - i) for i, p in enumerate(prompts)}))
+
+    frames = images.generate_images(prompts, PROFILE)
+
+    assert [f.index for f in frames] == list(range(6))
+    assert [f.caption for f in frames] == [f"caption {i}" for i in range(6)]
+
+
+def test_rate_limit_backs_off_the_shared_bucket_and_retries(imagen):
+    prompts = ["scene a [TEXT: a]", "scene b [TEXT: b]"]
+    model = FakeImagenModel(fail={"scene b": [RuntimeError("429 Quota exceeded")] * 2})
+    bucket = imagen(model)
+
+    frames = images.generate_images(prompts, PROFILE)
+
+    assert [f.caption for f in frames] == ["a", "b"]
+    assert model.calls.count("scene b") == 3
+    assert bucket.backoffs == [10, 20]  # doubled per retry, applied to the shared bucket
+    assert bucket.acquired == 4
+
+
+def test_failed_image_falls_back_to_previous_frame(imagen):
+    prompts = ["scene a [TEXT: a]", "scene b [TEXT: b]", "scene c [TEXT: c]"]
+    imagen(FakeImagenModel(fail={"scene b": [RuntimeError("400 blocked by safety filter")]}))
+
+    frames = images.generate_images(prompts, PROFILE)
+
+    assert len(frames) == 3
+    assert frames[1] is frames[0]
+    assert frames[2].caption == "c"
+
+
+def test_token_bucket_spaces_requests():
+    bucket = images._TokenBucket(rpm=600)  # one token per 0.1 s, burst 1
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.29
+
+
+def test_token_bucket_back_off_pauses_every_worker():
+    bucket = images._TokenBucket(rpm=6000)
+    bucket.acquire()
+    bucket.back_off(0.3)
+
+    waited = []
+
+    def worker():
+        started = time.monotonic()
+        bucket.acquire()
+        waited.append(time.monotonic() - started)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert min(waited) >= 0.29
+
+
+def test_corrupt_cache_entry_is_replaced_by_a_fresh_image(imagen, monkeypatch, tmp_path):
+    model = FakeImagenModel()
+    imagen(model)
+    monkeypatch.setattr(images, "IMAGE_CACHE_DIR", str(tmp_path))
+    cache_path = images._image_cache_path("fake-imagen", "a cat", PROFILE["aspect_ratio"])
+    images._image_cache_store(cache_path, b"\x89PNG truncated")
+
+    frames = images.generate_images(["a cat [TEXT: Cat]"], PROFILE)
+
+    assert model.calls == ["a cat"]
+    assert len(frames) == 1
+    with open(cache_path, "rb") as f:
+        assert f.read() == frames[0].image_bytes
+
+
+def test_undecodable_api_response_is_not_cached(imagen, monkeypatch, tmp_path):
+    model = FakeImagenModel()
+    model.generate_images = lambda **kwargs: [_Generated(b"not an image")]
+    imagen(model)
+    monkeypatch.setattr(images, "IMAGE_CACHE_DIR", str(tmp_path))
+
+    assert images.generate_images(["a dog"], PROFILE) == []
+    assert list(tmp_path.rglob("*.png")) == []
+
+
+def test_cache_write_failure_keeps_the_generated_image(imagen, monkeypatch, tmp_path):
+    model = FakeImagenModel()
+    imagen(model)
+    monkeypatch.setattr(images, "IMAGE_CACHE_DIR", str(tmp_path))
+
+    def full_disk(cache_path, data):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(images, "_image_cache_store", full_disk)
+
+    frames = images.generate_images(["a cat [TEXT: Cat]"], PROFILE)
+
+    assert model.calls == ["a cat"]
+    assert len(frames) == 1
+    assert frames[0].caption == "Cat"
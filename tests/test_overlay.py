@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from animated import overlay
+
+# the captions benchmark_overlay measures the stroke drift on
+CAPTIONS = [
+    "Save tax the smart way",
+    "Why your SIP beats the FD over ten years",
+    "Rates are up",
+    "The one rule every investor forgets about compounding",
+]
+
+pytestmark = pytest.mark.skipif(overlay._font_path() is None, reason="no TrueType caption font installed")
+
+
+@pytest.fixture(scope="module")
+def frame():
+    # fixed 1080x1920 gradient, so the caption box sits over varied pixels
+    rgb = np.zeros((1920, 1080, 3), np.uint8)
+    rgb[..., 0] = np.linspace(0, 255, 1080)[None, :]
+    rgb[..., 1] = np.linspace(0, 255, 1920)[:, None]
+    rgb[..., 2] = 90
+    return Image.fromarray(rgb).convert("RGBA")
+
+
+@pytest.mark.parametrize("position", ["bottom", "center"])
+@pytest.mark.parametrize("text", CAPTIONS)
+def test_native_stroke_matches_the_24_draw_outline(frame, text, position):
+    old = np.asarray(overlay._draw_caption(frame.copy(), text, position, stroke=False), dtype=np.int16)
+    new = np.asarray(overlay._draw_caption(frame.copy(), text, position, stroke=True), dtype=np.int16)
+    diff = np.abs(old - new).max(axis=2)
+
+    assert diff.mean() <= 0.03
+    assert int((diff > 64).sum()) == 0
+
+
+@pytest.mark.parametrize("position", ["bottom", "center"])
+@pytest.mark.parametrize("text", CAPTIONS + ["शेर रात में शिकार करता है", ""])
+def test_caption_sprite_matches_the_burned_in_box(frame, text, position):
+    burned = np.asarray(overlay._draw_caption(frame.copy(), text, position).convert("RGB"))
+    patch, (x0, y0, x1, y1) = overlay.caption_sprite(frame.size, text, position)
+
+    assert patch.shape == (y1 - y0, x1 - x0, 3)
+    np.testing.assert_array_equal(patch, burned[y0:y1, x0:x1])
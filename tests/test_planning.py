@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("vertexai")
+
+from animated.planning import _tokens, plan_image_groups
+
+
+def test_similar_adjacent_segments_share_an_image():
+    texts = [
+        "The lion hunts zebra at night",
+        "A lion hunts zebra in the dark night",
+        "Stock markets fell sharply today",
+    ]
+    assert plan_image_groups(texts, threshold=0.2, max_reuse=3) == [[0, 1], [2]]
+
+
+def test_groups_stop_at_max_reuse():
+    texts = ["lion hunts zebra"] * 5
+    assert plan_image_groups(texts, threshold=0.2, max_reuse=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_max_reuse_one_keeps_every_segment_apart():
+    texts = ["lion hunts zebra"] * 3
+    assert plan_image_groups(texts, threshold=0.0, max_reuse=1) == [[0], [1], [2]]
+
+
+def test_segments_without_text_never_join():
+    texts = ["lion hunts zebra", "", None, "lion hunts zebra"]
+    assert plan_image_groups(texts, threshold=0.2, max_reuse=4) == [[0], [1], [2], [3]]
+
+
+def test_every_segment_is_planned_once_in_order():
+    texts = ["lion", "lion zebra", "markets", "markets fell", "", "rain"]
+    groups = plan_image_groups(texts, threshold=0.2, max_reuse=3)
+    assert [i for group in groups for i in group] == list(range(len(texts)))
+
+
+def test_devanagari_words_stay_whole_and_stopwords_drop():
+    assert _tokens("शेर रात में शिकार करता है") == ["शेर", "रात", "शिकार", "करता"]
+    texts = ["शेर रात में शिकार करता है", "शेर रात में फिर शिकार करता है", "बाज़ार आज गिर गया"]
+    assert plan_image_groups(texts, threshold=0.2, max_reuse=3) == [[0, 1], [2]]
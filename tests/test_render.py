@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+pytest.importorskip("vertexai")
+pytest.importorskip("moviepy")
+from concurrent.futures.process import BrokenProcessPool
+
+from animated import render
+
+
+def test_segment_pool_is_replaced_after_a_worker_dies():
+    pool = render._segment_pool()
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()
+
+    fresh = render._segment_pool()
+    assert fresh is not pool
+    assert fresh.submit(pow, 2, 10).result() == 1024
+    assert render._segment_pool() is fresh
+
+
+@pytest.mark.parametrize("profile", ["draft", "upload", "archive"])
+def test_moviepy_params_leave_writer_flags_to_moviepy(monkeypatch, profile):
+    monkeypatch.setattr(render, "ENCODING_PROFILE", profile)
+    params = render._moviepy_params(threads=2)
+
+    assert params["preset"] == render.PROFILES[profile]["preset"]
+    assert params["threads"] == 2
+    flags = params["ffmpeg_params"][::2]
+    assert "-tune" in flags and "-crf" in flags and "-g" in flags
+    assert not {"-c:v", "-preset", "-threads", "-pix_fmt"} & set(flags)
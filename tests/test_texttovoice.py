@@ -0,0 +1,46 @@
+import os
+import sys
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.genai")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "trr"))
+import texttovoice  # noqa: E402
+
+
+def _chunk(data: bytes, mime_type: str = "audio/L16;rate=24000"):
+    part = SimpleNamespace(inline_data=SimpleNamespace(data=data, mime_type=mime_type))
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+def test_streaming_writer_patches_sizes_on_close(tmp_path):
+    path = str(tmp_path / "out.wav")
+    with texttovoice.StreamingWavWriter(path, 24000, 16) as writer:
+        writer.write(b"\x01\x00" * 100)
+        writer.write(b"\x02\x00" * 50)
+
+    with wave.open(path, "rb") as w:
+        assert (w.getframerate(), w.getsampwidth(), w.getnchannels()) == (24000, 2, 1)
+        assert w.readframes(w.getnframes()) == b"\x01\x00" * 100 + b"\x02\x00" * 50
+    assert os.path.getsize(path) == 44 + 300
+
+
+def test_write_audio_stream_joins_raw_and_wav_wrapped_chunks(tmp_path):
+    path = str(tmp_path / "nested" / "out.wav")
+    wrapped = texttovoice._wav_header(4, 24000, 16) + b"\x03\x00\x04\x00"
+    stream = [
+        _chunk(b"\x01\x00\x02\x00"),
+        SimpleNamespace(candidates=[]),  # keep-alive chunk without audio
+        _chunk(wrapped, "audio/wav"),
+    ]
+
+    assert texttovoice.write_audio_stream(stream, path) == 8
+    with wave.open(path, "rb") as w:
+        assert w.readframes(w.getnframes()) == b"\x01\x00\x02\x00\x03\x00\x04\x00"
+
+
+def test_write_audio_stream_without_audio_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        texttovoice.write_audio_stream([SimpleNamespace(candidates=[])], str(tmp_path / "out.wav"))
@@ -0,0 +1,104 @@
+import random
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("vertexai")
+
+from animated.transcript import _iter_timestamp_chunks, _segments_from_chunks
+
+
+def _legacy_segments_from_chunks(chunks, audio_duration, target_n, image_duration=5.0):
+    # the pre-rewrite mapper: every window rescans every chunk and takes the whole text
+    # of any chunk that overlaps it (so straddling chunks are repeated)
+    if target_n <= 0:
+        return []
+    seg_len = audio_duration / target_n if audio_duration > 0 else image_duration
+    segs = []
+    for i in range(target_n):
+        st = i * seg_len
+        en = min(audio_duration, (i + 1) * seg_len)
+        if i == target_n - 1 and audio_duration > 0:
+            en = audio_duration
+        texts = [text for start, end, text in chunks if not (end <= st or start >= en) and text]
+        segs.append({"start": st, "end": en, "text": " ".join(texts).strip()})
+    return segs
+
+
+def _random_chunks(rng, duration):
+    chunks, t, k = [], 0.0, 0
+    while t < duration + 5:
+        span = rng.uniform(0.5, 9.0)
+        words = [f"w{k + j}" for j in range(rng.randint(0, 12))]
+        k += len(words)
+        chunks.append((t, t + span, " ".join(words)))
+        t += span + rng.choice([0.0, 0.0, rng.uniform(0, 2)])
+    return chunks
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_legacy_windows_without_repeating_words(seed):
+    rng = random.Random(seed)
+    duration = rng.uniform(3, 400)
+    target_n = rng.randint(1, 80)
+    chunks = _random_chunks(rng, duration)
+
+    new = _segments_from_chunks(chunks, duration, target_n)
+    old = _legacy_segments_from_chunks(chunks, duration, target_n)
+
+    # same windows
+    assert [(s["start"], s["end"]) for s in new] == [(s["start"], s["end"]) for s in old]
+
+    placed = [w for seg in new for w in seg["text"].split()]
+    # no word lands in two windows (the legacy mapper repeated straddling chunks)
+    assert len(placed) == len(set(placed))
+    # every window's words come from text the legacy mapper also put there
+    for n, o in zip(new, old):
+        assert set(n["text"].split()) <= set(o["text"].split())
+
+    # every word whose time falls inside the audio is placed
+    expected = []
+    for start, end, text in chunks:
+        words = text.split()
+        for k, word in enumerate(words):
+            if start + (end - start) * (k + 0.5) / len(words) < new[-1]["end"]:
+                expected.append(word)
+    assert Counter(placed) == Counter(expected)
+
+
+def test_no_chunks_gives_uniform_empty_windows():
+    segs = _segments_from_chunks([], 12.0, 3)
+    assert [(s["start"], s["end"], s["text"]) for s in segs] == [(0.0, 4.0, ""), (4.0, 8.0, ""), (8.0, 12.0, "")]
+
+
+def test_straddling_chunk_is_split_by_overlap():
+    segs = _segments_from_chunks([(3.0, 7.0, "a b c d")], 10.0, 2)
+    assert [s["text"] for s in segs] == ["a b", "c d"]
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("[0:00-0:05] namaste doston", (0.0, 5.0, "namaste doston")),
+    ("(1:02:03.5 – 1:02:08) long form", (3723.5, 3728.0, "long form")),
+    ("**0:05 to 0:10:** markdown bold", (5.0, 10.0, "markdown bold")),
+    ("0:10 --> 0:15 srt arrow", (10.0, 15.0, "srt arrow")),
+    ("- [0:15 — 0:20] dash bullet", (15.0, 20.0, "dash bullet")),
+    ("[0:20,5-0:25] comma decimals", (20.5, 25.0, "comma decimals")),
+])
+def test_timestamp_variants(line, expected):
+    assert list(_iter_timestamp_chunks([line])) == [expected]
+
+
+def test_point_stamps_end_where_the_next_starts():
+    lines = ["[0:00] first", "", "not a timestamp", "[0:04] second", "[0:09-0:12] ranged"]
+    stats = {"lines": 0, "parsed": 0}
+    chunks = list(_iter_timestamp_chunks(lines, stats))
+    assert chunks == [(0.0, 4.0, "first"), (4.0, 9.0, "second"), (9.0, 12.0, "ranged")]
+    assert stats == {"lines": 4, "parsed": 3}
+
+
+def test_trailing_point_stamp_gets_one_image_duration():
+    assert list(_iter_timestamp_chunks(["[1:00] last"])) == [(60.0, 65.0, "last")]
+
+
+def test_empty_and_backwards_ranges_are_skipped():
+    assert list(_iter_timestamp_chunks(["[0:10-0:05] backwards", "[0:05-0:05] empty"])) == []
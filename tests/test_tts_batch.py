@@ -0,0 +1,110 @@
+import os
+import random
+import re
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rf"))
+import tts_batch  # noqa: E402
+
+WORDS = ["tax", "saving", "SIP", "₹5,000", "निवेश", "हर", "महीने", "compounding", "80C", "रिटर्न"]
+ENDINGS = [".", "!", "?", "।", "॥", ""]
+
+
+def _random_text(rng):
+    sentences = []
+    for _ in range(rng.randint(1, 40)):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 30))]
+        sentences.append(" ".join(words) + rng.choice(ENDINGS) + rng.choice([" ", "\n", "\n\n"]))
+    return "".join(sentences)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_chunks_fit_the_byte_budget_and_keep_every_word(seed):
+    rng = random.Random(seed)
+    text = _random_text(rng)
+    max_bytes = rng.choice([16, 40, 120, 500, 5000])
+
+    chunks = tts_batch.chunk_text(text, max_bytes)
+
+    assert all(0 < len(c.encode("utf-8")) <= max_bytes for c in chunks)
+    # whitespace-only pieces are dropped, everything else survives in order
+    assert re.sub(r"\s", "", "".join(chunks)) == re.sub(r"\s", "", text)
+
+
+def test_chunks_break_after_sentences():
+    text = "वाक्य। Second sentence here. Third one!"
+    assert tts_batch.chunk_text(text, 25) == ["वाक्य।", " Second sentence here.", " Third one!"]
+
+
+def test_oversized_word_is_cut_on_utf8_boundaries():
+    chunks = tts_batch.chunk_text("निवेश" * 10, 8)
+    assert all(len(c.encode("utf-8")) <= 8 for c in chunks)
+    assert "".join(chunks) == "निवेश" * 10
+
+
+CHUNKS = ["first chunk, the longest of them all", "second", "तीसरा हिस्सा", "four", "the fifth one"]
+
+
+@pytest.fixture(scope="module")
+def mock_tts():
+    endpoint = tts_batch.start_mock_server()
+    return endpoint, tts_batch.open_session(endpoint, "test-project", 4, use_auth=False)
+
+
+def _synthesize_wav(session, endpoint, text):
+    body = tts_batch.build_request(text, "gemini-2.5-flash-tts", "Kore", "")
+    return tts_batch.synthesize(session, endpoint, body)
+
+
+def _read_wav(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_concurrent_chunks_are_spliced_in_chunk_order(mock_tts, monkeypatch, tmp_path):
+    endpoint, session = mock_tts
+    expected = b"".join(tts_batch._split_wav(_synthesize_wav(session, endpoint, c))[0] for c in CHUNKS)
+    finished = []
+    real_synthesize = tts_batch.synthesize
+
+    def slow_early_chunks(session, endpoint, body):
+        # earlier chunks finish later, so results arrive in reverse order
+        text = body["input"]["text"]
+        time.sleep(0.05 * (len(CHUNKS) - CHUNKS.index(text)))
+        wav = real_synthesize(session, endpoint, body)
+        finished.append(text)
+        return wav
+    monkeypatch.setattr(tts_batch, "synthesize", slow_early_chunks)
+
+    out = str(tmp_path / "out.wav")
+    seconds = tts_batch.synthesize_to_wav(CHUNKS, out, session, endpoint, "gemini-2.5-flash-tts", "Kore", "", 4)
+
+    assert finished != CHUNKS  # the pool really did complete out of order
+    wav = _read_wav(out)
+    pcm, fmt = tts_batch._split_wav(wav)
+    assert fmt == (24000, 16, 1)
+    assert wav[:44] == tts_batch._wav_header(len(expected), 24000, 16, 1)
+    assert pcm == expected
+    assert seconds == pytest.approx(len(expected) / 2 / 24000)
+
+
+def test_mixed_sample_rates_cannot_be_spliced(mock_tts, monkeypatch, tmp_path):
+    endpoint, session = mock_tts
+    real_synthesize = tts_batch.synthesize
+
+    def resampled_second_chunk(session, endpoint, body):
+        wav = real_synthesize(session, endpoint, body)
+        if body["input"]["text"] != CHUNKS[1]:
+            return wav
+        pcm, _ = tts_batch._split_wav(wav)
+        return tts_batch._wav_header(len(pcm), 16000, 16, 1) + pcm
+    monkeypatch.setattr(tts_batch, "synthesize", resampled_second_chunk)
+
+    with pytest.raises(RuntimeError, match="cannot splice"):
+        tts_batch.synthesize_to_wav(
+            CHUNKS, str(tmp_path / "out.wav"), session, endpoint, "gemini-2.5-flash-tts", "Kore", "", 3
+        )
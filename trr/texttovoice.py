@@ -1,7 +1,7 @@
 import argparse
-import mimetypes
 import os
 import struct
+import time
 from google import genai
 from google.genai import types
 
@@ -23,25 +23,100 @@ def parse_audio_mime_type(mime_type: str) -> dict[str, int]:
                 pass
     return {"bits_per_sample": bits_per_sample, "rate": rate}
 
-def convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
-    params = parse_audio_mime_type(mime_type)
-    bits_per_sample = params["bits_per_sample"]
-    sample_rate = params["rate"]
-    num_channels = 1
-    data_size = len(audio_data)
+def _wav_header(data_size: int, sample_rate: int, bits_per_sample: int, num_channels: int = 1) -> bytes:
     bytes_per_sample = bits_per_sample // 8
     block_align = num_channels * bytes_per_sample
     byte_rate = sample_rate * block_align
     chunk_size = 36 + data_size
 
-    header = struct.pack(
+    return struct.pack(
         "<4sI4s4sIHHIIHH4sI",
         b"RIFF", chunk_size, b"WAVE",
         b"fmt ", 16, 1,
         num_channels, sample_rate, byte_rate, block_align, bits_per_sample,
         b"data", data_size
     )
-    return header + audio_data
+
+def _split_wav(audio_data: bytes):
+    # chunk already wrapped in a WAV container -> (pcm, params)
+    params = {"bits_per_sample": 16, "rate": 24000}
+    pos = 12
+    while pos + 8 <= len(audio_data):
+        chunk_id, chunk_size = struct.unpack("<4sI", audio_data[pos:pos + 8])
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            _, _, rate, _, _, bits = struct.unpack("<HHIIHH", audio_data[body:body + 16])
+            params = {"bits_per_sample": bits, "rate": rate}
+        elif chunk_id == b"data":
+            return audio_data[body:body + chunk_size], params
+        pos = body + chunk_size + (chunk_size & 1)
+    return b"", params
+
+class StreamingWavWriter:
+    """
+    Appends PCM to a WAV file as chunks arrive. A placeholder RIFF header goes
+    out first and its size fields are patched on close, so memory stays flat.
+    """
+
+    def __init__(self, path: str, sample_rate: int, bits_per_sample: int, num_channels: int = 1):
+        self.sample_rate = sample_rate
+        self.bits_per_sample = bits_per_sample
+        self.num_channels = num_channels
+        self.data_size = 0
+        self.f = open(path, "wb")
+        self.f.write(_wav_header(0, sample_rate, bits_per_sample, num_channels))
+
+    def write(self, pcm: bytes):
+        self.f.write(pcm)
+        self.data_size += len(pcm)
+
+    def close(self):
+        if self.f.closed:
+            return
+        self.f.seek(0)
+        self.f.write(_wav_header(self.data_size, self.sample_rate, self.bits_per_sample, self.num_channels))
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_audio_stream(stream, out_wav: str) -> int:
+    """
+    Writes every inline audio part of a generate_content_stream response to
+    out_wav as it arrives. Returns the number of PCM bytes written.
+    """
+    os.makedirs(os.path.dirname(out_wav) or ".", exist_ok=True)
+    started = time.perf_counter()
+    writer = None
+    try:
+        for chunk in stream:
+            cand = (chunk.candidates or [None])[0]
+            if not cand or not cand.content or not cand.content.parts:
+                continue
+            for part in cand.content.parts:
+                inline = getattr(part, "inline_data", None)
+                if not inline or not inline.data:
+                    continue
+
+                if inline.data[:4] == b"RIFF":
+                    pcm, params = _split_wav(inline.data)
+                else:
+                    pcm, params = inline.data, parse_audio_mime_type(inline.mime_type or "audio/L16;rate=24000")
+
+                if writer is None:
+                    writer = StreamingWavWriter(out_wav, params["rate"], params["bits_per_sample"])
+                    print(f"First audio after {time.perf_counter() - started:.2f}s")
+                writer.write(pcm)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise RuntimeError("No audio returned.")
+    return writer.data_size
 
 def main():
     ap = argparse.ArgumentParser()
@@ -70,32 +145,10 @@ def main():
         ),
     )
 
-    audio_bytes = None
-    audio_mime = None
-
-    for chunk in client.models.generate_content_stream(model=args.model, contents=contents, config=config):
-        cand = (chunk.candidates or [None])[0]
-        if not cand or not cand.content or not cand.content.parts:
-            continue
-        part0 = cand.content.parts[0]
-        if getattr(part0, "inline_data", None) and part0.inline_data.data:
-            audio_bytes = part0.inline_data.data
-            audio_mime = part0.inline_data.mime_type
-            break
-
-    if not audio_bytes:
-        raise RuntimeError("No audio returned.")
-
-    # Ensure WAV container
-    ext = mimetypes.guess_extension(audio_mime or "")
-    if ext != ".wav":
-        audio_bytes = convert_to_wav(audio_bytes, audio_mime or "audio/L16;rate=24000")
-
-    os.makedirs(os.path.dirname(args.out_wav) or ".", exist_ok=True)
-    with open(args.out_wav, "wb") as f:
-        f.write(audio_bytes)
+    stream = client.models.generate_content_stream(model=args.model, contents=contents, config=config)
+    data_size = write_audio_stream(stream, args.out_wav)
 
-    print(f"Wrote: {args.out_wav}")
+    print(f"Wrote: {args.out_wav} ({data_size} bytes of audio)")
 
 if __name__ == "__main__":
     main()